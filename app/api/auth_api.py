@@ -1,22 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 import logging
 from app.db.session import get_db
+from app.db.replicas import get_user_read_db
 from app.schemas.user_schema import UserRegister, UserLogin, UserResponse, TokenResponse
 from app.services.auth_service import create_user, authenticate_user, get_user_by_id
 from app.core.auth import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, get_current_user_id
+from app.core.rate_limit import rate_limit_auth
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+# El rate limit se resuelve antes que get_db y que el trabajo de bcrypt
+router = APIRouter(dependencies=[Depends(rate_limit_auth)])
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
 
-    logger.info(f"Intento de registro para el email: {user_data.email}")
+    logger.info("Intento de registro para el email: %s", user_data.email)
     
-    user = create_user(db, user_data)
-    logger.info(f"Usuario registrado exitosamente: {user.email} (ID: {user.id})")
+    user = await create_user(db, user_data)
+    logger.info("Usuario registrado exitosamente: %s (ID: %s)", user.email, user.id)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -31,12 +34,12 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
 
-    logger.info(f"Intento de login para el email: {credentials.email}")
+    logger.info("Intento de login para el email: %s", credentials.email)
     
-    user = authenticate_user(db, credentials.email, credentials.password)
-    logger.info(f"Login exitoso para el usuario: {user.email} (ID: {user.id})")
+    user = await authenticate_user(db, credentials.email, credentials.password)
+    logger.info("Login exitoso para el usuario: %s (ID: %s)", user.email, user.id)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
@@ -54,15 +57,15 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_user_read_db),
     user_id: int = Depends(get_current_user_id)
 ):
     
-    logger.info(f"Intento de renovacion de token para el usuario ID: {user_id}")
-    user = get_user_by_id(db, user_id)
+    logger.info("Intento de renovacion de token para el usuario ID: %s", user_id)
+    user = await get_user_by_id(db, user_id)
     
     if not user:
-        logger.warning(f"Intento de renovacion fallido: usuario no encontrado (ID: {user_id})")
+        logger.warning("Intento de renovacion fallido: usuario no encontrado (ID: %s)", user_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado"
@@ -75,7 +78,7 @@ async def refresh_token(
         expires_delta=access_token_expires
     )
     
-    logger.info(f"Token renovado exitosamente para: {user.email} (ID: {user.id})")
+    logger.info("Token renovado exitosamente para: %s (ID: %s)", user.email, user.id)
     
     return TokenResponse(
         access_token=access_token,
@@ -1,33 +1,172 @@
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, Header, status, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, Optional
+import csv
+import io
 import logging
-from app.db.session import get_db
-from app.schemas.task_schema import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, TaskStatus
+import time
+from app.db.session import get_db, AsyncSessionLocal
+from app.db.replicas import get_read_db, get_user_read_db
+from app.schemas.task_schema import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskListResponse,
+    TaskStatsResponse,
+    TaskStatus,
+    TaskBulkUpdateItem,
+    TaskBulkCreateRequest,
+    TaskBulkUpdateRequest,
+    TaskBulkDeleteRequest,
+    TaskBulkItemError,
+    TaskBulkResponse,
+    TaskBulkDeleteResponse
+)
 from app.services.task_service import (
     create_task,
     get_task_by_id,
     get_user_tasks,
     update_task,
     delete_task,
-    get_all_tasks
+    get_all_tasks,
+    get_task_stats,
+    bulk_create_tasks,
+    bulk_update_tasks,
+    bulk_delete_tasks,
+    stream_user_tasks
 )
 from app.core.auth import get_current_user_id
+from app.core.compression import compress_body, negotiate_encoding
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.rate_limit import rate_limit_tasks
+from app.core.responses import PydanticJSONResponse
+from app.services.task_cache_service import (
+    get_task_cache_version,
+    build_etag,
+    get_cached_response,
+    set_cached_response
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+# El rate limit se resuelve antes que las sesiones de base de datos
+router = APIRouter(dependencies=[Depends(rate_limit_tasks)])
 
 """ NOTA: El usuario debe estar autenticado para todas las operaciones de sus tareas """
 
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def _cached_json(user_id: int, params: tuple, if_none_match: Optional[str], accept_encoding: Optional[str], build: Callable[[], Awaitable[BaseModel]]) -> Response:
+    """Responder desde la cache versionada del usuario, o construir y cachear la respuesta
+
+    Con un If-None-Match vigente responde 304 sin consultar la base de datos.
+    Los cuerpos grandes se cachean tambien comprimidos con la codificacion
+    negociada, para no comprimir de nuevo en cada acierto.
+    """
+    version = await get_task_cache_version(user_id)
+    if version is None:
+        return PydanticJSONResponse(await build())
+
+    encoding = negotiate_encoding(accept_encoding)
+    encoded_params = params + (encoding,)
+    # Cada codificacion es una representacion distinta con su propio ETag
+    etag = build_etag(user_id, version, encoded_params if encoding else params)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding is not None:
+        encoded = await get_cached_response(user_id, version, encoded_params)
+        if encoded is not None:
+            return Response(content=encoded, media_type="application/json", headers={**headers, "Content-Encoding": encoding})
+
+    body = await get_cached_response(user_id, version, params)
+    if body is None:
+        body = (await build()).model_dump_json().encode("utf-8")
+        await set_cached_response(user_id, version, params, body)
+
+    if encoding is not None and len(body) >= settings.COMPRESSION_MIN_SIZE:
+        encoded = compress_body(body, encoding)
+        await set_cached_response(user_id, version, encoded_params, encoded)
+        return Response(content=encoded, media_type="application/json", headers={**headers, "Content-Encoding": encoding})
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Campos que se pueden pedir con fields=, en el orden de TaskResponse
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+FIELDS_DESCRIPTION = f"Campos a devolver separados por coma ({', '.join(TASK_FIELDS)}); por defecto todos"
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Validar fields= contra TaskResponse (None = todos los campos)"""
+    if fields is None:
+        return None
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    invalid = sorted(requested - set(TASK_FIELDS))
+    if not requested:
+        raise ValidationError(f"fields no puede estar vacio. Permitidos: {', '.join(TASK_FIELDS)}")
+    if invalid:
+        raise ValidationError(f"Campos invalidos: {', '.join(invalid)}. Permitidos: {', '.join(TASK_FIELDS)}")
+
+    # Orden canonico: el mismo conjunto de campos usa la misma clave de cache
+    selected = tuple(field for field in TASK_FIELDS if field in requested)
+    return None if len(selected) == len(TASK_FIELDS) else selected
+
+
+def _sparse_task(task: Any, fields: tuple[str, ...]) -> TaskResponse:
+    """TaskResponse solo con los campos pedidos
+
+    model_construct no valida (los valores vienen de la base) y los campos no
+    asignados no se serializan.
+    """
+    return TaskResponse.model_construct(**{field: getattr(task, field) for field in fields})
+
+
+def _check_bulk_size(item_count: int) -> None:
+    if item_count > settings.TASK_BULK_MAX_ITEMS:
+        raise ValidationError(f"Se permiten como maximo {settings.TASK_BULK_MAX_ITEMS} items por solicitud")
+
+
+def _validate_bulk_items(raw_items: list[dict[str, Any]], schema: type[BaseModel]) -> tuple[list[tuple[int, BaseModel]], list[TaskBulkItemError]]:
+    """Validar cada item por separado, devolviendo (indice, item) validos y errores"""
+    _check_bulk_size(len(raw_items))
+
+    valid_items = []
+    errors = []
+    for index, raw_item in enumerate(raw_items):
+        try:
+            valid_items.append((index, schema.model_validate(raw_item)))
+        except PydanticValidationError as exc:
+            raw_id = raw_item.get("id")
+            errors.append(TaskBulkItemError(
+                index=index,
+                id=raw_id if isinstance(raw_id, int) else None,
+                detail=exc.errors()[0]["msg"]
+            ))
+
+    return valid_items, errors
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_task(
     task_data: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
-    logger.info(f"Usuario {user_id} creando nueva tarea: {task_data.title}")
-    task = create_task(db, task_data, user_id)
-    logger.info(f"Tarea creada exitosamente (ID: {task.id}) para usuario {user_id}")
+    logger.info("Usuario %s creando nueva tarea: %s", user_id, task_data.title)
+    task = await create_task(db, task_data, user_id)
+    logger.info("Tarea creada exitosamente (ID: %s) para usuario %s", task.id, user_id)
     return task
 
 
@@ -36,25 +175,41 @@ async def list_tasks(
     page: int = Query(1, ge=1, description="Numero de pagina"),
     page_size: int = Query(10, ge=1, le=100, description="Cantidad de registros por pagina"),
     status_filter: Optional[TaskStatus] = Query(None, description="Filtrar por status: pending, in_progress, completed, overdue"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor de la respuesta anterior); si se envia, se ignora page"),
+    include_total: bool = Query(True, description="Calcular total y total_pages; false omite el conteo"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Buscar en titulo y descripcion; resultados ordenados por relevancia"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_user_read_db),
     user_id: int = Depends(get_current_user_id)
 ):
     
-    logger.info(f"Usuario {user_id} consultando tareas - Pagina: {page}, Filtro: {status_filter}")
+    logger.info("Usuario %s consultando tareas - Pagina: %s, Filtro: %s, Cursor: %s, Busqueda: %s", user_id, page, status_filter, cursor, q)
     skip = (page - 1) * page_size
+    selected_fields = _parse_fields(fields)
 
-    tasks, total = get_user_tasks(db, user_id, skip, page_size, status_filter)
+    async def build() -> TaskListResponse:
+        tasks, total, next_cursor = await get_user_tasks(db, user_id, skip, page_size, status_filter, cursor, include_total, q, selected_fields)
+        if selected_fields is not None:
+            tasks = [_sparse_task(task, selected_fields) for task in tasks]
 
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-    logger.debug(f"Retornando {len(tasks)} tareas de {total} totales para usuario {user_id}")
+        total_pages = None
+        if total is not None:
+            total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+        logger.debug("Retornando %s tareas de %s totales para usuario %s", len(tasks), total, user_id)
 
-    return TaskListResponse(
-        tasks=tasks,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+        return TaskListResponse(
+            tasks=tasks,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            next_cursor=next_cursor
+        )
+
+    params = ("list", page, page_size, status_filter, cursor, include_total, q, selected_fields)
+    return await _cached_json(user_id, params, if_none_match, accept_encoding, build)
 
 
 @router.get("/all", response_model=TaskListResponse)
@@ -62,51 +217,215 @@ async def list_all_tasks(
     page: int = Query(1, ge=1, description="Numero de pagina"),
     page_size: int = Query(10, ge=1, le=100, description="Cantidad de registros por pagina"),
     status_filter: Optional[TaskStatus] = Query(None, description="Filtrar por status: pending, in_progress, completed, overdue"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor de la respuesta anterior); si se envia, se ignora page"),
+    include_total: bool = Query(True, description="Calcular total y total_pages; false omite el conteo"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
 ):
 
-    logger.info(f"Consulta de todas las tareas - Pagina: {page}, Filtro: {status_filter}")
+    logger.info("Consulta de todas las tareas - Pagina: %s, Filtro: %s, Cursor: %s", page, status_filter, cursor)
     skip = (page - 1) * page_size
+    selected_fields = _parse_fields(fields)
 
-    tasks, total = get_all_tasks(db, skip, page_size, status_filter)
+    tasks, total, next_cursor = await get_all_tasks(db, skip, page_size, status_filter, cursor, include_total, selected_fields)
+    if selected_fields is not None:
+        tasks = [_sparse_task(task, selected_fields) for task in tasks]
 
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-    logger.debug(f"Retornando {len(tasks)} tareas de {total} totales (todas las tareas)")
+    total_pages = None
+    if total is not None:
+        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    logger.debug("Retornando %s tareas de %s totales (todas las tareas)", len(tasks), total)
 
-    return TaskListResponse(
+    return PydanticJSONResponse(TaskListResponse(
         tasks=tasks,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    ))
+
+
+# overdue y due_this_week dependen de la hora y no solo de las escrituras: la
+# respuesta cacheada de /stats (y su ETag) vale como maximo esta ventana
+STATS_CACHE_WINDOW_SECONDS = 60
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def task_stats(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_user_read_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Conteos por status, vencidas y que vencen esta semana del usuario autenticado"""
+    logger.info("Usuario %s consultando estadisticas de tareas", user_id)
+
+    async def build() -> TaskStatsResponse:
+        return TaskStatsResponse(**await get_task_stats(db, user_id))
+
+    window = int(time.time() // STATS_CACHE_WINDOW_SECONDS)
+    return await _cached_json(user_id, ("stats", window), if_none_match, accept_encoding, build)
+
+
+@router.get("/all/stats", response_model=TaskStatsResponse)
+async def all_task_stats(db: AsyncSession = Depends(get_read_db)):
+    """Estadisticas globales de todas las tareas"""
+    logger.info("Consulta de estadisticas de todas las tareas")
+    return PydanticJSONResponse(TaskStatsResponse(**await get_task_stats(db)))
+
+
+EXPORT_COLUMNS = list(TaskResponse.model_fields)
+
+
+async def _export_tasks(user_id: int, export_format: str, status_filter: Optional[TaskStatus], since: Optional[datetime]) -> AsyncIterator[str]:
+    """Generar el archivo de exportacion lote a lote"""
+    # La sesion de get_db se cierra antes de enviar el cuerpo de la respuesta,
+    # por eso el generador abre la suya y la mantiene mientras dura el stream
+    async with AsyncSessionLocal() as db:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+
+            async for rows in stream_user_tasks(db, user_id, status_filter, since):
+                buffer.seek(0)
+                buffer.truncate()
+                for row in rows:
+                    task = TaskResponse.model_validate(row).model_dump(mode="json")
+                    writer.writerow([task[column] if task[column] is not None else "" for column in EXPORT_COLUMNS])
+                yield buffer.getvalue()
+        else:
+            async for rows in stream_user_tasks(db, user_id, status_filter, since):
+                yield "".join(TaskResponse.model_validate(row).model_dump_json() + "\n" for row in rows)
+
+
+@router.get("/export")
+async def export_tasks(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Formato de exportacion: ndjson o csv"),
+    status_filter: Optional[TaskStatus] = Query(None, description="Filtrar por status: pending, in_progress, completed, overdue"),
+    since: Optional[datetime] = Query(None, description="Exportar solo tareas creadas despues de esta fecha (ISO 8601)"),
+    user_id: int = Depends(get_current_user_id)
+):
+
+    logger.info("Usuario %s exportando tareas - Formato: %s, Filtro: %s, Desde: %s", user_id, export_format, status_filter, since)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_tasks(user_id, export_format, status_filter, since),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'}
     )
 
 
+@router.post("/bulk", response_model=TaskBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(
+    request: TaskBulkCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+
+    logger.info("Usuario %s creando %s tareas en bloque", user_id, len(request.tasks))
+    valid_items, errors = _validate_bulk_items(request.tasks, TaskCreate)
+
+    tasks = []
+    if valid_items:
+        tasks = await bulk_create_tasks(db, [item for _, item in valid_items], user_id)
+
+    logger.info("Creacion en bloque: %s creadas, %s con error (usuario %s)", len(tasks), len(errors), user_id)
+    return TaskBulkResponse(tasks=tasks, errors=errors)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def update_tasks_bulk(
+    request: TaskBulkUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+
+    logger.info("Usuario %s actualizando %s tareas en bloque", user_id, len(request.tasks))
+    valid_items, errors = _validate_bulk_items(request.tasks, TaskBulkUpdateItem)
+
+    # Un mismo ID solo puede actualizarse una vez por solicitud
+    items_by_id = {}
+    for index, item in valid_items:
+        if item.id in items_by_id:
+            errors.append(TaskBulkItemError(index=index, id=item.id, detail="ID duplicado en la solicitud"))
+        else:
+            items_by_id[item.id] = (index, item)
+
+    tasks = []
+    if items_by_id:
+        tasks = await bulk_update_tasks(db, [item for _, item in items_by_id.values()], user_id)
+
+    updated_ids = {task.id for task in tasks}
+    for task_id, (index, _) in items_by_id.items():
+        if task_id not in updated_ids:
+            errors.append(TaskBulkItemError(index=index, id=task_id, detail="Tarea no encontrada"))
+
+    errors.sort(key=lambda error: error.index)
+    logger.info("Actualizacion en bloque: %s actualizadas, %s con error (usuario %s)", len(tasks), len(errors), user_id)
+    return TaskBulkResponse(tasks=tasks, errors=errors)
+
+
+@router.delete("/bulk", response_model=TaskBulkDeleteResponse)
+async def delete_tasks_bulk(
+    request: TaskBulkDeleteRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+
+    logger.info("Usuario %s eliminando %s tareas en bloque", user_id, len(request.ids))
+    _check_bulk_size(len(request.ids))
+
+    deleted_ids = await bulk_delete_tasks(db, list(dict.fromkeys(request.ids)), user_id)
+
+    deleted = set(deleted_ids)
+    errors = [
+        TaskBulkItemError(index=index, id=task_id, detail="Tarea no encontrada")
+        for index, task_id in enumerate(request.ids)
+        if task_id not in deleted
+    ]
+
+    logger.info("Eliminacion en bloque: %s eliminadas, %s con error (usuario %s)", len(deleted_ids), len(errors), user_id)
+    return TaskBulkDeleteResponse(deleted_ids=deleted_ids, errors=errors)
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_user_read_db),
     user_id: int = Depends(get_current_user_id)
 ):
     
-    logger.info(f"Usuario {user_id} consultando tarea ID: {task_id}")
-    task = get_task_by_id(db, task_id, user_id)
+    logger.info("Usuario %s consultando tarea ID: %s", user_id, task_id)
+    selected_fields = _parse_fields(fields)
 
-    return task
+    async def build() -> TaskResponse:
+        task = await get_task_by_id(db, task_id, user_id, selected_fields)
+        if selected_fields is not None:
+            return _sparse_task(task, selected_fields)
+        return TaskResponse.model_validate(task)
+
+    return await _cached_json(user_id, ("task", task_id, selected_fields), if_none_match, accept_encoding, build)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_existing_task(
     task_id: int,
     task_data: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
 
-    logger.info(f"Usuario {user_id} actualizando tarea ID: {task_id}")
-    task = update_task(db, task_id, task_data, user_id)
+    logger.info("Usuario %s actualizando tarea ID: %s", user_id, task_id)
+    task = await update_task(db, task_id, task_data, user_id)
 
-    logger.info(f"Tarea {task_id} actualizada exitosamente por usuario {user_id}")
+    logger.info("Tarea %s actualizada exitosamente por usuario %s", task_id, user_id)
 
     return task
 
@@ -114,13 +433,13 @@ async def update_existing_task(
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
 async def delete_existing_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
 
-    logger.info(f"Usuario {user_id} eliminando tarea ID: {task_id}")
-    delete_task(db, task_id, user_id)
+    logger.info("Usuario %s eliminando tarea ID: %s", user_id, task_id)
+    await delete_task(db, task_id, user_id)
   
-    logger.info(f"Tarea {task_id} eliminada exitosamente por usuario {user_id}")
+    logger.info("Tarea %s eliminada exitosamente por usuario %s", task_id, user_id)
     
     return {"message": "Tarea eliminada con exito", "task_id": task_id}
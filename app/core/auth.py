@@ -1,4 +1,9 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import threading
+import time
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
@@ -13,6 +18,70 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 security = HTTPBearer()
 
 
+class TokenCache:
+    """Cache LRU de tokens ya verificados: sha256(token) -> (user_id, exp)
+
+    Evita repetir la verificacion HMAC y el parseo del JWT en cada peticion con
+    el mismo bearer. Las entradas dejan de ser validas al expirar el token.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        # get_current_user_id es sincrona: FastAPI la ejecuta en el threadpool
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[int]:
+        if self.max_size <= 0:
+            return None
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user_id, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user_id
+
+    def set(self, token: str, user_id: int, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Crear un token JWT"""
     to_encode = data.copy()
@@ -32,7 +101,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
 def decode_access_token(token: str) -> dict:
     """Decodificar un token JWT"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Sin exp el token no venceria nunca (y no se podria cachear)
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp"]})
         return payload
     except jwt.PyJWTError:
         return None
@@ -41,6 +111,11 @@ def decode_access_token(token: str) -> dict:
 def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
 
     token = credentials.credentials
+
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+
     payload = decode_access_token(token)
     
     if payload is None:
@@ -59,10 +134,14 @@ def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(secu
         )
     
     try:
-        return int(user_id)
+        user_id = int(user_id)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ID de usuario inválido en el token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Solo se cachean tokens verificados; decode_access_token exige el claim exp
+    token_cache.set(token, user_id, payload["exp"])
+    return user_id
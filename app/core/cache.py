@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Optional
+import logging
+import threading
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interfaz comun de las caches: valores en bytes con TTL opcional (segundos)"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCache(CacheBackend):
+    """Cache LRU en memoria del proceso, con expiracion por entrada"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache(CacheBackend):
+    """Cache compartida sobre un cliente asincrono compatible con redis.asyncio
+
+    Recibe el cliente ya construido, por lo que puede reemplazarse por un fake
+    local. Los errores de Redis se registran y se tratan como fallos de cache:
+    la peticion continua contra la base de datos.
+    """
+
+    def __init__(self, client, prefix: str = "logika:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(self.prefix + key)
+        except Exception as exc:
+            logger.warning("Error leyendo de la cache Redis (%s): %s", key, exc)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        try:
+            await self.client.set(self.prefix + key, value, ex=ttl)
+        except Exception as exc:
+            logger.warning("Error escribiendo en la cache Redis (%s): %s", key, exc)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as exc:
+            logger.warning("Error eliminando de la cache Redis (%s): %s", keys, exc)
+
+
+def build_cache() -> CacheBackend:
+    """Construir la cache configurada en CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)")
+        return RedisCache(redis.from_url(settings.REDIS_URL))
+
+    return InMemoryCache(settings.CACHE_MAX_ENTRIES)
+
+
+cache: CacheBackend = build_cache()
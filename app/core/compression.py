@@ -0,0 +1,110 @@
+"""
+Codificaciones de compresion de respuestas (zstd, br y gzip).
+
+brotli y zstandard estan en requirements.txt; si una instalacion no los
+tiene, la codificacion no se ofrece y los clientes reciben gzip.
+"""
+from typing import Callable, Optional
+import gzip
+import zlib
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Tipos de contenido que vale la pena comprimir (texto)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class StreamCompressor:
+    """Compresion incremental: cada bloque se emite completo (flush) para no
+    retener datos de una respuesta en streaming"""
+
+    def __init__(self, compress: Callable[[bytes], bytes], finish: Callable[[], bytes]):
+        self.compress = compress
+        self.finish = finish
+
+
+def _gzip_stream() -> StreamCompressor:
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return StreamCompressor(
+        lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli_stream() -> StreamCompressor:
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return StreamCompressor(lambda data: compressor.process(data) + compressor.flush(), compressor.finish)
+
+
+def _zstd_stream() -> StreamCompressor:
+    compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+    return StreamCompressor(
+        lambda data: compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# codificacion -> (compresion de un cuerpo completo, compresor incremental)
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[], StreamCompressor]]] = {
+    # mtime=0: el mismo cuerpo produce siempre los mismos bytes (cacheables)
+    "gzip": (lambda data: gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0), _gzip_stream),
+}
+if brotli is not None:
+    CODECS["br"] = (lambda data: brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY), _brotli_stream)
+if zstandard is not None:
+    CODECS["zstd"] = (lambda data: zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(data), _zstd_stream)
+
+
+def available_encodings() -> list[str]:
+    """Codificaciones de COMPRESSION_ENCODINGS instaladas, en orden de preferencia"""
+    preferred = [encoding.strip() for encoding in settings.COMPRESSION_ENCODINGS.split(",")]
+    return [encoding for encoding in preferred if encoding in CODECS]
+
+
+ENCODINGS = available_encodings()
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Elegir la codificacion segun Accept-Encoding (None = sin comprimir)"""
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = [encoding for encoding in ENCODINGS if accepted.get(encoding, wildcard) > 0]
+    if not candidates:
+        return None
+    # Mayor q del cliente; a igual q, el orden de COMPRESSION_ENCODINGS
+    return max(candidates, key=lambda encoding: accepted.get(encoding, wildcard))
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    return CODECS[encoding][0](body)
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    return CODECS[encoding][1]()
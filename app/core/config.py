@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Literal
 from dotenv import load_dotenv
 import os
 
@@ -18,11 +18,100 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = os.getenv('POSTGRES_SERVER')
     POSTGRES_PORT: str = os.getenv('POSTGRES_PORT')
     POSTGRES_DB: str = os.getenv('POSTGRES_DB')
+    # Driver asincrono usado por la API (el driver sincrono queda para Alembic y scripts)
+    DB_ASYNC_DRIVER: str = os.getenv('DB_ASYNC_DRIVER', 'asyncpg')
+
+    # Pool de conexiones (por proceso worker)
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    # Segundos antes de reciclar una conexion (-1 = nunca)
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', '-1'))
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_POOL_USE_LIFO: bool = os.getenv('DB_POOL_USE_LIFO', 'false').lower() == 'true'
+
+    # Replicas de lectura (URLs separadas por coma; vacio = todo va al primario)
+    DATABASE_REPLICA_URLS: str = os.getenv('DATABASE_REPLICA_URLS', '')
+    # Segundos que una replica queda fuera de rotacion tras un error de conexion
+    DB_REPLICA_EJECT_SECONDS: int = int(os.getenv('DB_REPLICA_EJECT_SECONDS', '30'))
+    DB_REPLICA_CONNECT_TIMEOUT: float = float(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', '3'))
+    # Segundos despues de una escritura en los que el usuario lee del primario
+    DB_REPLICA_STICKY_SECONDS: int = int(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))
     
     # Configuración JWT
     SECRET_KEY: str = os.getenv('SECRET_KEY')
     ALGORITHM: str = os.getenv('ALGORITHM')
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES'))
+    # Tokens verificados que se mantienen en cache por proceso (0 = deshabilitado)
+    TOKEN_CACHE_SIZE: int = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+
+    # Configuración de cache: memory (por proceso) o redis (compartida)
+    CACHE_BACKEND: Literal['memory', 'redis'] = os.getenv('CACHE_BACKEND', 'memory')
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_MAX_ENTRIES: int = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv('USER_CACHE_TTL_SECONDS', '300'))
+    # Cache de respuestas de tareas por usuario. Con varios workers exige
+    # CACHE_BACKEND=redis: la invalidacion en memoria es local a cada proceso
+    TASK_CACHE_ENABLED: bool = os.getenv('TASK_CACHE_ENABLED', 'false').lower() == 'true'
+    TASK_CACHE_TTL_SECONDS: int = int(os.getenv('TASK_CACHE_TTL_SECONDS', '300'))
+
+    # Configuración de hashing de contraseñas (bcrypt)
+    BCRYPT_ROUNDS: int = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = os.getenv('PASSWORD_HASH_EXECUTOR', 'thread')
+    PASSWORD_HASH_WORKERS: int = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    # Operaciones que pueden esperar en cola antes de responder 503
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '32'))
+
+    # Rate limiting (token bucket) por grupo de rutas: "<peticiones>/<segundos>".
+    # /auth se limita por IP y /tasks por usuario. memory limita por proceso;
+    # redis comparte los buckets entre workers
+    RATE_LIMIT_ENABLED: bool = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND: Literal['memory', 'redis'] = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_AUTH: str = os.getenv('RATE_LIMIT_AUTH', '10/60')
+    RATE_LIMIT_TASK_READ: str = os.getenv('RATE_LIMIT_TASK_READ', '600/60')
+    RATE_LIMIT_TASK_WRITE: str = os.getenv('RATE_LIMIT_TASK_WRITE', '120/60')
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+
+    # Compresion de respuestas: codificaciones en orden de preferencia (br y zstd
+    # usan los paquetes brotli / zstandard), tamaño minimo y niveles
+    COMPRESSION_ENABLED: bool = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_ENCODINGS: str = os.getenv('COMPRESSION_ENCODINGS', 'zstd,br,gzip')
+    COMPRESSION_MIN_SIZE: int = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv('COMPRESSION_GZIP_LEVEL', '5'))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3'))
+
+    # Estrategia de conteo del total en los listados de tareas:
+    # exact (COUNT por peticion), counter (tabla task_counters) o estimate
+    # (pg_class.reltuples para /tasks/all sin filtro, exact en el resto)
+    TASK_COUNT_STRATEGY: Literal['exact', 'counter', 'estimate'] = os.getenv('TASK_COUNT_STRATEGY', 'exact')
+    # Maximo de items por solicitud en los endpoints /tasks/bulk
+    TASK_BULK_MAX_ITEMS: int = int(os.getenv('TASK_BULK_MAX_ITEMS', '1000'))
+
+    # Barrido periodico que marca como overdue las tareas con due_date vencida
+    OVERDUE_SWEEP_ENABLED: bool = os.getenv('OVERDUE_SWEEP_ENABLED', 'true').lower() == 'true'
+    OVERDUE_SWEEP_INTERVAL_SECONDS: int = int(os.getenv('OVERDUE_SWEEP_INTERVAL_SECONDS', '60'))
+    OVERDUE_SWEEP_BATCH_SIZE: int = int(os.getenv('OVERDUE_SWEEP_BATCH_SIZE', '500'))
+
+    # Servidor (app/server.py): development (un proceso con --reload) o production
+    SERVER_MODE: Literal['development', 'production'] = os.getenv('SERVER_MODE', 'development')
+    SERVER_HOST: str = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT: int = int(os.getenv('SERVER_PORT', '8000'))
+    # IPs (separadas por coma, o *) de los proxies cuyo X-Forwarded-For se acepta
+    # como IP del cliente; el rate limit de /auth y /tasks/all depende de ella
+    FORWARDED_ALLOW_IPS: str = os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1')
+    # 0 = un worker por CPU si cache y rate limit usan Redis, si no 1 (ver app/server.py)
+    SERVER_WORKERS: int = int(os.getenv('SERVER_WORKERS', '0'))
+    # Segundos para terminar las peticiones en curso al apagar antes de cortarlas
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', '30'))
+    # Segundos maximos de espera a PostgreSQL al iniciar el contenedor
+    DB_WAIT_TIMEOUT: int = int(os.getenv('DB_WAIT_TIMEOUT', '60'))
+
+    # Logging: nivel, formato (json | text) y fraccion de peticiones cuyos logs
+    # INFO se conservan (WARNING y superiores se conservan siempre)
+    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT: Literal['json', 'text'] = os.getenv('LOG_FORMAT', 'json')
+    LOG_INFO_SAMPLE_RATE: float = float(os.getenv('LOG_INFO_SAMPLE_RATE', '1.0'))
     
     @property
     def DATABASE_URL(self) -> str:
@@ -30,6 +119,22 @@ class Settings(BaseSettings):
             f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+{self.DB_ASYNC_DRIVER}://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+    @property
+    def REPLICA_URLS(self) -> list[str]:
+        """URLs de las replicas con el driver asincrono"""
+        urls = [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        return [
+            url.replace("postgresql://", f"postgresql+{self.DB_ASYNC_DRIVER}://", 1) if url.startswith("postgresql://") else url
+            for url in urls
+        ]
     
     class Config:
         case_sensitive = True
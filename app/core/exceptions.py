@@ -18,4 +18,13 @@ class NotFoundError(HTTPException):
 
 class InternalServerError(HTTPException):
     def __init__(self, detail: str = "Error interno del servidor"):
-        super().__init__(status_code=500, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=500, detail=detail)
+
+class TooManyRequestsError(HTTPException):
+    def __init__(self, detail: str = "Demasiadas solicitudes, intente nuevamente mas tarde", retry_after: int = 1):
+        super().__init__(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+class ServiceUnavailableError(HTTPException):
+    def __init__(self, detail: str = "Servicio no disponible", retry_after: int = None):
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+        super().__init__(status_code=503, detail=detail, headers=headers)
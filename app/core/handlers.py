@@ -17,13 +17,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 async def http_exception_handler(request: Request, exc: HTTPException):
+    # Conservar headers como WWW-Authenticate o Retry-After
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "time": datetime.now().isoformat(),
             "success": False
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
@@ -0,0 +1,101 @@
+"""
+Configuracion de logging de la API.
+
+Los handlers de salida corren en un QueueListener (thread aparte): el codigo
+de la peticion solo encola el LogRecord, y el formateo del mensaje (argumentos
+estilo %) y la escritura ocurren fuera del event loop.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import logging
+import queue
+import random
+import sys
+import orjson
+from app.core.config import settings
+
+# Id y decision de muestreo de la peticion en curso (ver RequestIdMiddleware)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+request_sampled_var: ContextVar[bool] = ContextVar("request_sampled", default=True)
+
+_listener: Optional[QueueListener] = None
+
+
+def should_sample_request() -> bool:
+    """Decidir si se conservan los logs INFO de una peticion nueva"""
+    rate = settings.LOG_INFO_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
+class RequestContextFilter(logging.Filter):
+    """Agregar request_id al registro y descartar los INFO de peticiones no muestreadas
+
+    Corre en el thread que emite el log, donde las contextvars de la peticion
+    estan disponibles. WARNING y superiores se conservan siempre.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if record.levelno <= logging.INFO and record.request_id is not None:
+            return request_sampled_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por linea"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode("utf-8")
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare formatea el mensaje en el thread que loguea; el
+    # listener comparte el proceso, asi que el registro se encola sin tocar
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging() -> None:
+    """Instalar QueueHandler en el logger raiz y arrancar el QueueListener"""
+    global _listener
+    if _listener is not None:
+        return
+
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s")
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vaciar la cola y detener el listener (al apagar la aplicacion)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
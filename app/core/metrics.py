@@ -0,0 +1,167 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from typing import Iterable, Optional, Sequence
+
+# Buckets por defecto (segundos) para latencias
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histograma acumulativo de buckets fijos, seguro entre threads"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # Un contador por bucket mas el bucket +Inf
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Buckets acumulados (le -> cantidad), suma y cantidad de observaciones"""
+        with self._lock:
+            counts = list(self._counts)
+            total_sum, total_count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+
+        return {"buckets": cumulative, "sum": total_sum, "count": total_count}
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_histogram(name: str, snapshot: dict, labels: Optional[dict] = None) -> list[str]:
+    """Lineas _bucket/_sum/_count de un Histogram.snapshot() en formato Prometheus"""
+    labels = labels or {}
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+    return lines
+
+
+def format_metric(name: str, metric_type: str, documentation: str, samples: Iterable[tuple[dict, float]]) -> list[str]:
+    """Bloque HELP/TYPE y muestras (labels, valor) de un gauge o counter"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+class LabeledHistogram:
+    """Un Histogram por combinacion de valores de labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: dict[tuple, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, Histogram(self.buckets))
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(format_histogram(self.name, child.snapshot(), dict(zip(self.labelnames, values))))
+        return lines
+
+
+class LabeledCounter:
+    """Contador monotono por combinacion de valores de labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            samples = sorted(self._values.items())
+        return format_metric(
+            self.name, "counter", self.documentation,
+            ((dict(zip(self.labelnames, values)), value) for values, value in samples)
+        )
+
+
+# Metricas HTTP y de base de datos del proceso actual
+REQUEST_LATENCY = LabeledHistogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP por ruta", ("method", "route")
+)
+REQUEST_COUNT = LabeledCounter(
+    "http_requests_total", "Peticiones HTTP por ruta y codigo de estado", ("method", "route", "status")
+)
+REQUEST_QUERIES = LabeledHistogram(
+    "http_request_db_queries", "Sentencias SQL ejecutadas por peticion", ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_QUERY_DURATION = Histogram()
+RATE_LIMITED = LabeledCounter(
+    "rate_limit_rejections_total", "Peticiones rechazadas con 429 por grupo de rutas", ("group",)
+)
+
+
+class QueryStats:
+    """Sentencias SQL y tiempo acumulado dentro de una peticion"""
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# El contexto se propaga al greenlet en el que SQLAlchemy ejecuta el driver,
+# por lo que los hooks del engine ven las estadisticas de la peticion en curso
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def track_queries() -> tuple[QueryStats, object]:
+    """Empezar a acumular las sentencias SQL del contexto actual (devuelve stats y token)"""
+    stats = QueryStats()
+    return stats, _current_query_stats.set(stats)
+
+
+def stop_tracking_queries(token) -> None:
+    _current_query_stats.reset(token)
+
+
+def record_query(duration: float) -> None:
+    """Registrar una sentencia SQL ejecutada (llamado desde los hooks del engine)"""
+    DB_QUERY_DURATION.observe(duration)
+    stats = _current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
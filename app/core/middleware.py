@@ -0,0 +1,167 @@
+import time
+import uuid
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.compression import compress_body, is_compressible, negotiate_encoding, stream_compressor
+from app.core.config import settings
+from app.core.logging_config import request_id_var, request_sampled_var, should_sample_request
+from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, REQUEST_QUERIES, track_queries, stop_tracking_queries
+
+
+class MetricsMiddleware:
+    """Latencia, codigo de estado y sentencias SQL por ruta
+
+    Agrega el header Server-Timing con las sentencias SQL ejecutadas y su
+    duracion hasta el momento de enviar la respuesta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        queries, token = track_queries()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;desc="{queries.count} queries";dur={queries.duration * 1000:.2f}, app;dur={elapsed_ms:.2f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stop_tracking_queries(token)
+            # Plantilla de la ruta (no el path) para acotar la cantidad de series
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route_path).observe(time.perf_counter() - start)
+            REQUEST_QUERIES.labels(method, route_path).observe(queries.count)
+            REQUEST_COUNT.inc(method, route_path, str(status_code))
+
+
+class RequestIdMiddleware:
+    """Asignar un id a cada peticion (X-Request-ID) para correlacionar sus logs
+
+    Se respeta el X-Request-ID recibido (por ejemplo del proxy) si es valido.
+    Tambien decide si los logs INFO de la peticion se muestrean.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id")
+        if not request_id or len(request_id) > 128 or not request_id.isprintable():
+            request_id = uuid.uuid4().hex
+
+        id_token = request_id_var.set(request_id)
+        sampled_token = request_sampled_var.set(should_sample_request())
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_sampled_var.reset(sampled_token)
+            request_id_var.reset(id_token)
+
+
+class CompressionMiddleware:
+    """Comprimir las respuestas de texto segun Accept-Encoding
+
+    Un cuerpo completo se comprime solo si supera COMPRESSION_MIN_SIZE; las
+    respuestas en streaming se comprimen bloque a bloque. Las respuestas que ya
+    traen Content-Encoding (por ejemplo precomprimidas en la cache) pasan sin
+    cambios.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Los headers se envian junto con el primer bloque del cuerpo
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                chunk = compressor.compress(body)
+                if not more_body:
+                    chunk += compressor.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            skip = (
+                start_message["status"] < 200 or start_message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or "no-transform" in headers.get("cache-control", "")
+                or not is_compressible(headers.get("content-type"))
+                or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE)
+            )
+            if skip:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            # El cuerpo codificado es otra representacion: el ETag fuerte pasa a debil
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            if more_body:
+                del headers["Content-Length"]
+                compressor = stream_compressor(encoding)
+                body = compressor.compress(body)
+            else:
+                body = compress_body(body, encoding)
+                headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, task_id: int, rank: Optional[float] = None) -> str:
+    """Codificar (created_at, id) de la ultima fila en un cursor opaco (y su rank en una busqueda)"""
+    values = [created_at.isoformat(), task_id]
+    if rank is not None:
+        values.append(rank)
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, Optional[float]]:
+    """Decodificar un cursor generado por encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id, *rank = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if len(rank) > 1:
+            raise ValueError("cursor con valores de mas")
+        return datetime.fromisoformat(created_at), int(task_id), float(rank[0]) if rank else None
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginacion invalido"
+        )
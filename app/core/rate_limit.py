@@ -0,0 +1,176 @@
+from collections import OrderedDict
+import logging
+import math
+import threading
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPBearer
+from fastapi.security.http import HTTPAuthorizationCredentials
+from app.core.auth import get_current_user_id
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsError
+from app.core.metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate(spec: str) -> tuple[int, float]:
+    """Convertir "<peticiones>/<segundos>" en (capacidad, tokens por segundo)"""
+    try:
+        requests, seconds = spec.split("/")
+        capacity, period = int(requests), float(seconds)
+    except ValueError:
+        raise ValueError(f"Limite invalido '{spec}': se espera '<peticiones>/<segundos>'")
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f"Limite invalido '{spec}': peticiones y segundos deben ser positivos")
+    return capacity, capacity / period
+
+
+class RateLimitBackend:
+    """Interfaz comun de los token buckets: consumir un token de una clave"""
+
+    async def acquire(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Consumir un token; devuelve 0 si se admite o los segundos hasta el proximo token"""
+        raise NotImplementedError
+
+
+class InMemoryRateLimiter(RateLimitBackend):
+    """Token buckets en memoria del proceso (cada worker limita por separado)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # clave -> (tokens disponibles, instante de la ultima recarga)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Descartar el bucket menos usado equivale a devolverlo lleno
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+# Recarga y consumo atomicos en Redis; el reloj es el del servidor (TIME) para
+# que todos los workers compartan la misma referencia
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimitBackend):
+    """Token buckets compartidos entre workers sobre un cliente redis.asyncio
+
+    Si Redis falla, la peticion se admite (se registra el error): el limite no
+    debe tirar la API.
+    """
+
+    def __init__(self, client, prefix: str = "logika:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, capacity: int, refill_rate: float) -> float:
+        try:
+            return float(await self._script(keys=[self.prefix + key], args=[capacity, refill_rate]))
+        except Exception as exc:
+            logger.warning("Error consultando el rate limit en Redis (%s): %s", key, exc)
+            return 0.0
+
+
+def build_rate_limiter() -> RateLimitBackend:
+    """Construir el backend configurado en RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere el paquete 'redis' (pip install redis)")
+        return RedisRateLimiter(redis.from_url(settings.REDIS_URL))
+
+    return InMemoryRateLimiter(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter: RateLimitBackend = build_rate_limiter()
+
+# Grupos de rutas -> (capacidad, tokens por segundo)
+RATE_LIMITS = {
+    "auth": parse_rate(settings.RATE_LIMIT_AUTH),
+    "task_read": parse_rate(settings.RATE_LIMIT_TASK_READ),
+    "task_write": parse_rate(settings.RATE_LIMIT_TASK_WRITE),
+}
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Sin auto_error: las rutas publicas (/tasks/all) se limitan por IP
+optional_security = HTTPBearer(auto_error=False)
+
+
+def client_ip(request: Request) -> str:
+    """IP del cliente
+
+    Detras de un proxy es la de X-Forwarded-For solo si la IP del proxy esta en
+    FORWARDED_ALLOW_IPS (app/server.py); si no, todos los clientes comparten
+    la IP del proxy y el mismo bucket.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+async def check_rate_limit(group: str, identity: str) -> None:
+    """Consumir un token del grupo para identity o responder 429 con Retry-After"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    capacity, refill_rate = RATE_LIMITS[group]
+    wait = await rate_limiter.acquire(f"{group}:{identity}", capacity, refill_rate)
+    if wait > 0:
+        RATE_LIMITED.inc(group)
+        logger.warning("Rate limit '%s' excedido por %s", group, identity)
+        raise TooManyRequestsError(retry_after=max(1, math.ceil(wait)))
+
+
+async def rate_limit_auth(request: Request) -> None:
+    """Limite por IP de /auth (login y registro hacen bcrypt)"""
+    await check_rate_limit("auth", f"ip:{client_ip(request)}")
+
+
+async def rate_limit_tasks(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> None:
+    """Limite por usuario (sub del JWT) de /tasks, separado en lecturas y escrituras"""
+    identity = f"ip:{client_ip(request)}"
+    if credentials is not None:
+        try:
+            identity = f"user:{get_current_user_id(credentials)}"
+        except HTTPException:
+            # Token invalido: se limita por IP y la ruta responde 401 despues
+            pass
+
+    group = "task_read" if request.method in READ_METHODS else "task_write"
+    await check_rate_limit(group, identity)
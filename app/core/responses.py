@@ -0,0 +1,17 @@
+from typing import Any
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class PydanticJSONResponse(Response):
+    """Respuesta JSON serializada directamente por pydantic-core
+
+    Un modelo ya validado se serializa en un solo paso (model_dump_json), sin
+    pasar por la revalidacion de response_model ni por jsonable_encoder.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
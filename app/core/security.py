@@ -1,4 +1,15 @@
+import asyncio
 import bcrypt
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+# Pool compartido para el trabajo de bcrypt y cantidad de operaciones en curso
+# (ejecutandose o en cola). Solo se modifica desde el event loop.
+_executor: Optional[Executor] = None
+_in_flight: int = 0
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
 
@@ -6,7 +17,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
 
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
 
     return hashed.decode("utf-8")
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indica si el costo del hash guardado difiere de BCRYPT_ROUNDS"""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt"
+            )
+    return _executor
+
+
+async def _run_in_pool(func, *args):
+    """Ejecutar func en el pool de bcrypt, rechazando con 503 si esta saturado"""
+    global _in_flight
+    if _in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise ServiceUnavailableError(
+            "Servicio de autenticacion saturado, intente nuevamente",
+            retry_after=1
+        )
+
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password fuera del event loop"""
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash fuera del event loop"""
+    return await _run_in_pool(get_password_hash, password)
+
+
+def shutdown_password_pool() -> None:
+    """Liberar los workers del pool (al apagar la aplicacion)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def password_pool_stats() -> dict:
+    """Operaciones de bcrypt en curso y capacidad antes de responder 503"""
+    return {
+        "in_flight": _in_flight,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "capacity": settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE,
+    }
@@ -14,7 +14,7 @@ from app.db.session import Base
 
 # Importar todos los modelos para que Alembic los detecte
 from app.models.user_model import User
-from app.models.task_model import Task
+from app.models.task_model import Task, TaskCounter
 
 # Configuración de Alembic
 config = context.config
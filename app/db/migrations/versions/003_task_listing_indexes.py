@@ -0,0 +1,76 @@
+"""Indices compuestos para los listados de tareas
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+Motivacion:
+- Los listados de task_service filtran por user_id (y opcionalmente status) y
+  ordenan por (created_at DESC, id DESC). Con solo ix_tasks_user_id, Postgres
+  tiene que leer todas las tareas del usuario y ordenarlas en cada pagina.
+- ix_tasks_id e ix_users_id duplican el indice de la PRIMARY KEY y solo
+  agregan costo de escritura.
+
+Los indices se crean con CREATE INDEX CONCURRENTLY (fuera de la transaccion de
+Alembic) para poder aplicar la migracion sobre una tabla en uso.
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Identificadores de revisión
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, columnas) de los indices de listado
+LISTING_INDEXES = [
+    # GET /tasks
+    ('ix_tasks_user_id_created_at_id', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]),
+    # GET /tasks?status_filter=...
+    ('ix_tasks_user_id_status_created_at', ['user_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')]),
+    # GET /tasks/all?status_filter=...
+    ('ix_tasks_status_created_at', ['status', sa.text('created_at DESC'), sa.text('id DESC')]),
+    # GET /tasks/all
+    ('ix_tasks_created_at_id', [sa.text('created_at DESC'), sa.text('id DESC')]),
+]
+
+
+def upgrade() -> None:
+    logger.info("[003] Creando indices de listado de tareas (CONCURRENTLY)")
+
+    # CREATE/DROP INDEX CONCURRENTLY no puede ejecutarse dentro de una transaccion
+    with op.get_context().autocommit_block():
+        for name, columns in LISTING_INDEXES:
+            op.create_index(name, 'tasks', columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+        logger.info("[003] Eliminando indices redundantes con la PRIMARY KEY")
+        op.drop_index('ix_tasks_id', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_id', table_name='users',
+                      postgresql_concurrently=True, if_exists=True)
+
+    logger.info("[003] Migración completada exitosamente")
+
+
+def downgrade() -> None:
+    logger.info("[003] Revirtiendo indices de listado de tareas")
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_id', 'users', ['id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+        for name, _ in reversed(LISTING_INDEXES):
+            op.drop_index(name, table_name='tasks',
+                          postgresql_concurrently=True, if_exists=True)
+
+    logger.info("[003] Downgrade completado")
@@ -0,0 +1,57 @@
+"""Tabla task_counters para el total de los listados
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+Motivacion:
+- Cada listado ejecutaba un COUNT sobre las tareas filtradas antes de traer la
+  pagina. Con TASK_COUNT_STRATEGY=counter el total se lee de esta tabla, que
+  create_task/update_task/delete_task mantienen en la misma transaccion.
+
+La tabla se rellena a partir del contenido actual de tasks.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import logging
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Identificadores de revisión
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    logger.info("[004] Creando tabla 'task_counters'")
+    op.create_table(
+        'task_counters',
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('status', postgresql.ENUM(name='taskstatus', create_type=False), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+
+    logger.info("[004] Rellenando 'task_counters' desde 'tasks'")
+    op.execute(
+        """
+        INSERT INTO task_counters (user_id, status, count)
+        SELECT user_id, status, COUNT(*)
+        FROM tasks
+        GROUP BY user_id, status
+        """
+    )
+
+    logger.info("[004] Migración completada exitosamente")
+
+
+def downgrade() -> None:
+    logger.info("[004] Eliminando tabla 'task_counters'")
+    op.drop_table('task_counters')
+    logger.info("[004] Downgrade completado")
@@ -0,0 +1,50 @@
+"""Indice parcial de due_date para el barrido de tareas vencidas
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+Motivacion:
+- El barrido periodico busca tareas pending/in_progress con due_date < now().
+  Un indice parcial sobre due_date que solo contiene tareas abiertas con fecha
+  de vencimiento mantiene esa busqueda acotada aunque la tabla crezca con
+  tareas completadas.
+
+El indice se crea con CREATE INDEX CONCURRENTLY (fuera de la transaccion).
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Identificadores de revisión
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    logger.info("[005] Creando indice parcial 'ix_tasks_due_date_open' (CONCURRENTLY)")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_due_date_open', 'tasks', ['due_date'], unique=False,
+            postgresql_where=sa.text("status IN ('pending', 'in_progress') AND due_date IS NOT NULL"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+    logger.info("[005] Migración completada exitosamente")
+
+
+def downgrade() -> None:
+    logger.info("[005] Eliminando indice 'ix_tasks_due_date_open'")
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_due_date_open', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+
+    logger.info("[005] Downgrade completado")
@@ -0,0 +1,79 @@
+"""Busqueda por texto sobre titulo y descripcion de tareas
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+Motivacion:
+- GET /tasks?q=... busca dentro de las tareas de un usuario. La columna
+  generada search_vector (titulo con peso A, descripcion con peso B) evita
+  recalcular to_tsvector en cada consulta.
+- Los indices GIN incluyen user_id (btree_gin) para que la busqueda se resuelva
+  dentro de las tareas del usuario y no sobre toda la tabla.
+- El indice de trigramas (pg_trgm) sobre title cubre coincidencias parciales
+  o por prefijo que el diccionario de text search no encuentra.
+
+ADD COLUMN ... GENERATED STORED reescribe la tabla (bloqueo exclusivo durante
+la reescritura); los indices se crean con CREATE INDEX CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import logging
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Identificadores de revisión
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    logger.info("[006] Habilitando extensiones pg_trgm y btree_gin")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    logger.info("[006] Agregando columna generada 'search_vector' a 'tasks'")
+    op.add_column('tasks', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True
+    ))
+
+    logger.info("[006] Creando indices de busqueda (CONCURRENTLY)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_user_id_search_vector', 'tasks', ['user_id', 'search_vector'],
+            unique=False, postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_tasks_user_id_title_trgm', 'tasks', ['user_id', 'title'],
+            unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+    logger.info("[006] Migración completada exitosamente")
+
+
+def downgrade() -> None:
+    logger.info("[006] Eliminando indices y columna de busqueda")
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_user_id_title_trgm', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_user_id_search_vector', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('tasks', 'search_vector')
+
+    logger.info("[006] Downgrade completado")
@@ -0,0 +1,230 @@
+"""Particionar tasks por HASH (user_id)
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+Motivacion:
+- Todas las consultas de usuario (listados, busqueda, stats, update/delete)
+  filtran por user_id. Con la tabla particionada por HASH (user_id) cada una
+  toca una sola particion, y sus indices (y su autovacuum) escalan con el
+  tamaño de la particion y no con el de toda la tabla.
+
+La migracion copia y reemplaza la tabla sin bloquearla durante la copia:
+1. Crea tasks_partitioned (PARTITION BY HASH (user_id)) con N particiones
+   tasks_p0 ... tasks_p{N-1}. La PRIMARY KEY pasa a ser (id, user_id) porque
+   Postgres exige que incluya la clave de particion; id sigue saliendo de
+   tasks_id_seq, asi que no se repite.
+2. Un trigger sobre tasks replica en la tabla nueva cada INSERT/UPDATE/DELETE.
+3. Copia las filas existentes en lotes por id (una transaccion por lote) y
+   elimina las filas que un DELETE concurrente haya dejado huerfanas.
+4. Crea los indices por particion con CREATE INDEX CONCURRENTLY y los adjunta
+   al indice de la tabla padre.
+5. En una transaccion corta (LOCK ACCESS EXCLUSIVE) elimina la tabla vieja,
+   renombra la nueva a tasks y mueve la propiedad de la secuencia.
+
+Variables de entorno:
+- TASK_PARTITIONS: cantidad de particiones (default 16).
+- TASK_PARTITION_BATCH_SIZE: filas por lote de copia (default 50000).
+- TASK_PARTITION_LOCK_TIMEOUT: espera maxima del LOCK final (default 10s).
+
+El downgrade hace el mismo copiado a una tabla sin particionar.
+"""
+from alembic import op
+import sqlalchemy as sa
+import logging
+import os
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# Identificadores de revisión
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+PARTITIONS = int(os.getenv('TASK_PARTITIONS', '16'))
+BATCH_SIZE = int(os.getenv('TASK_PARTITION_BATCH_SIZE', '50000'))
+LOCK_TIMEOUT = os.getenv('TASK_PARTITION_LOCK_TIMEOUT', '10s')
+
+# Columnas que se copian (search_vector es generada y se recalcula en la tabla nueva)
+COPY_COLUMNS = ['id', 'title', 'description', 'user_id', 'status', 'due_date', 'created_at']
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'B')"
+)
+
+# (nombre, definicion) de los indices de tasks (migraciones 001, 003, 005 y 006)
+TASK_INDEXES = [
+    ('ix_tasks_user_id', "(user_id)"),
+    ('ix_tasks_user_id_created_at_id', "(user_id, created_at DESC, id DESC)"),
+    ('ix_tasks_user_id_status_created_at', "(user_id, status, created_at DESC, id DESC)"),
+    ('ix_tasks_status_created_at', "(status, created_at DESC, id DESC)"),
+    ('ix_tasks_created_at_id', "(created_at DESC, id DESC)"),
+    ('ix_tasks_due_date_open',
+     "(due_date) WHERE status IN ('pending', 'in_progress') AND due_date IS NOT NULL"),
+    ('ix_tasks_user_id_search_vector', "USING gin (user_id, search_vector)"),
+    ('ix_tasks_user_id_title_trgm', "USING gin (user_id, title gin_trgm_ops)"),
+]
+
+
+def _partition_names(partitions: int) -> list[str]:
+    return [f"tasks_p{remainder}" for remainder in range(partitions)]
+
+
+def _create_table(target: str, partitions: int) -> list[str]:
+    """Crear la tabla destino (particionada si partitions > 0) y devolver sus particiones"""
+    pk_columns = "id, user_id" if partitions else "id"
+    partition_by = " PARTITION BY HASH (user_id)" if partitions else ""
+
+    op.execute(f"""
+        CREATE TABLE {target} (
+            id BIGINT NOT NULL DEFAULT nextval('tasks_id_seq'::regclass),
+            title VARCHAR(255) NOT NULL,
+            description TEXT,
+            user_id BIGINT NOT NULL,
+            status taskstatus NOT NULL,
+            due_date TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            search_vector TSVECTOR GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED,
+            CONSTRAINT {target}_pkey PRIMARY KEY ({pk_columns}),
+            CONSTRAINT {target}_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)
+        ){partition_by}
+    """)
+
+    names = _partition_names(partitions)
+    for remainder, name in enumerate(names):
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF {target} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    return names
+
+
+def _install_mirror(target: str, conflict_columns: str) -> None:
+    """Replicar en target las escrituras sobre tasks mientras dura la copia"""
+    columns = ", ".join(COPY_COLUMNS)
+    new_values = ", ".join(f"NEW.{column}" for column in COPY_COLUMNS)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in COPY_COLUMNS if column not in ('id', 'user_id'))
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION tasks_mirror_to_{target}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {target} WHERE id = OLD.id AND user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {target} ({columns}) VALUES ({new_values})
+                ON CONFLICT ({conflict_columns}) DO UPDATE SET {updates};
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(
+        f"CREATE TRIGGER tasks_mirror_to_{target} AFTER INSERT OR UPDATE OR DELETE ON tasks "
+        f"FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_{target}()"
+    )
+
+
+def _drop_mirror(target: str) -> None:
+    op.execute(f"DROP TRIGGER IF EXISTS tasks_mirror_to_{target} ON tasks")
+    op.execute(f"DROP FUNCTION IF EXISTS tasks_mirror_to_{target}()")
+
+
+def _backfill(target: str, conflict_columns: str) -> None:
+    """Copiar las filas existentes en lotes por id; las que ya replico el trigger se respetan"""
+    columns = ", ".join(COPY_COLUMNS)
+    copy_sql = (
+        f"INSERT INTO {target} ({columns}) SELECT {columns} FROM tasks "
+        f"WHERE id > :lower AND id <= :upper ON CONFLICT ({conflict_columns}) DO NOTHING"
+    )
+
+    if op.get_context().as_sql:
+        # Modo offline: sin conexion no se conoce el rango de ids
+        op.execute(
+            f"INSERT INTO {target} ({columns}) SELECT {columns} FROM tasks "
+            f"ON CONFLICT ({conflict_columns}) DO NOTHING"
+        )
+        return
+
+    connection = op.get_bind()
+    lower, max_id = connection.execute(sa.text("SELECT COALESCE(MIN(id), 1) - 1, COALESCE(MAX(id), 0) FROM tasks")).one()
+    copied = 0
+    while lower < max_id:
+        upper = lower + BATCH_SIZE
+        copied += connection.execute(sa.text(copy_sql), {"lower": lower, "upper": upper}).rowcount
+        lower = upper
+    logger.info("[007] %s filas copiadas a '%s'", copied, target)
+
+    # Un DELETE que llega mientras un lote lee su snapshot puede dejar la fila en target
+    orphans = connection.execute(sa.text(
+        f"DELETE FROM {target} AS copied WHERE NOT EXISTS "
+        f"(SELECT 1 FROM tasks WHERE tasks.id = copied.id AND tasks.user_id = copied.user_id)"
+    )).rowcount
+    if orphans:
+        logger.info("[007] %s filas eliminadas durante la copia descartadas", orphans)
+
+
+def _create_indexes(target: str, partitions: list[str]) -> None:
+    """Crear los indices con nombre temporal sin bloquear escrituras"""
+    for name, definition in TASK_INDEXES:
+        if not partitions:
+            op.execute(f"CREATE INDEX CONCURRENTLY {name}_new ON {target} {definition}")
+            continue
+
+        # CONCURRENTLY no se admite sobre la tabla padre: indice invalido en el
+        # padre, indice concurrente en cada particion y ATTACH
+        op.execute(f"CREATE INDEX {name}_new ON ONLY {target} {definition}")
+        for partition in partitions:
+            partition_index = f"{partition}_{name.removeprefix('ix_tasks_')}"
+            op.execute(f"CREATE INDEX CONCURRENTLY {partition_index} ON {partition} {definition}")
+            op.execute(f"ALTER INDEX {name}_new ATTACH PARTITION {partition_index}")
+
+
+def _copy_and_swap(target: str, partitions: int) -> None:
+    conflict_columns = "id, user_id" if partitions else "id"
+
+    # Restos de una ejecucion anterior interrumpida
+    _drop_mirror(target)
+    op.execute(f"DROP TABLE IF EXISTS {target} CASCADE")
+
+    logger.info("[007] Creando '%s'", target)
+    partition_names = _create_table(target, partitions)
+    _install_mirror(target, conflict_columns)
+
+    with op.get_context().autocommit_block():
+        logger.info("[007] Copiando tareas en lotes de %s", BATCH_SIZE)
+        _backfill(target, conflict_columns)
+
+        logger.info("[007] Creando indices (CONCURRENTLY)")
+        _create_indexes(target, partition_names)
+        op.execute(f"ANALYZE {target}")
+
+    logger.info("[007] Reemplazando 'tasks' por '%s'", target)
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    _drop_mirror(target)
+    op.execute(f"ALTER SEQUENCE tasks_id_seq OWNED BY {target}.id")
+    op.execute("DROP TABLE tasks")
+    op.execute(f"ALTER TABLE {target} RENAME TO tasks")
+    op.execute(f"ALTER TABLE tasks RENAME CONSTRAINT {target}_pkey TO tasks_pkey")
+    op.execute(f"ALTER TABLE tasks RENAME CONSTRAINT {target}_user_id_fkey TO tasks_user_id_fkey")
+    for name, _ in TASK_INDEXES:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    logger.info("[007] Particionando 'tasks' por HASH (user_id) en %s particiones", PARTITIONS)
+    _copy_and_swap('tasks_partitioned', PARTITIONS)
+    logger.info("[007] Migración completada exitosamente")
+
+
+def downgrade() -> None:
+    logger.info("[007] Volviendo 'tasks' a una tabla sin particionar")
+    _copy_and_swap('tasks_unpartitioned', 0)
+    logger.info("[007] Downgrade completado")
@@ -0,0 +1,45 @@
+import time
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.metrics import Histogram
+
+# Tiempo de espera para obtener una conexion del pool (segundos)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que registra cuanto espera cada checkout"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # Conservar el histograma cuando el engine recrea el pool (dispose)
+        new_pool = super().recreate()
+        new_pool.wait_time = self.wait_time
+        return new_pool
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """Estado actual del pool de conexiones de un engine"""
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # overflow() es negativo mientras el pool no alcanza pool_size
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    wait_time = getattr(pool, "wait_time", None)
+    if wait_time is not None:
+        stats["wait_time_seconds"] = wait_time.snapshot()
+    return stats
@@ -0,0 +1,184 @@
+"""
+Ruteo de lecturas a replicas de PostgreSQL.
+
+Las dependencias get_read_db / get_user_read_db entregan una sesion sobre una
+replica (round-robin) elegida al ejecutar la primera consulta. Una replica
+que falla al conectar queda fuera de rotacion DB_REPLICA_EJECT_SECONDS y la
+lectura sigue en la siguiente o en el primario. Despues de que un usuario escribe, sus lecturas van al primario
+durante DB_REPLICA_STICKY_SECONDS para que vea sus propios cambios aunque la
+replica tenga retraso. Sin DATABASE_REPLICA_URLS todo va al primario.
+"""
+from typing import AsyncIterator
+import asyncio
+import logging
+import time
+from fastapi import Depends
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from app.core.auth import get_current_user_id
+from app.core.cache import cache
+from app.core.config import settings
+from app.db.pool import pool_stats
+from app.db.session import AsyncSessionLocal, async_engine, create_api_engine
+
+logger = logging.getLogger(__name__)
+
+# Errores al abrir una conexion contra una replica caida o inalcanzable
+_CONNECT_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError)
+
+
+class ReplicaRouter:
+    """Replicas de lectura con round-robin y expulsion temporal por errores"""
+
+    def __init__(self, urls: list[str], eject_seconds: int, connect_timeout: float):
+        # Timeout de conexion corto: una replica inalcanzable no debe demorar la lectura
+        self.engines: list[AsyncEngine] = [
+            create_api_engine(url, connect_args={"timeout": connect_timeout} if "+asyncpg" in url else {})
+            for url in urls
+        ]
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(self.engines)
+        self._next = 0
+
+    def candidates(self) -> list[AsyncEngine]:
+        """Replicas en rotacion, empezando por la siguiente del round-robin"""
+        count = len(self.engines)
+        if not count:
+            return []
+        start = self._next
+        self._next = (start + 1) % count
+        now = time.monotonic()
+        return [
+            self.engines[index]
+            for index in ((start + offset) % count for offset in range(count))
+            if self._ejected_until[index] <= now
+        ]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        index = self.engines.index(engine)
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning("Replica %s fuera de rotacion por %ss", engine.url.render_as_string(hide_password=True), self.eject_seconds)
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": ejected_until <= now,
+                "pool": pool_stats(engine),
+            }
+            for engine, ejected_until in zip(self.engines, self._ejected_until)
+        ]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.REPLICA_URLS, settings.DB_REPLICA_EJECT_SECONDS, settings.DB_REPLICA_CONNECT_TIMEOUT)
+
+
+class ReplicaSession(AsyncSession):
+    """Sesion que elige la replica al ejecutar la primera consulta
+
+    Hasta entonces no abre ninguna conexion: una respuesta servida desde la
+    cache (304) no toca la base. Si la replica elegida no acepta la conexion,
+    sale de rotacion y la sesion pasa a la siguiente o al primario.
+    """
+
+    _bound = False
+
+    async def _bind_replica(self) -> None:
+        if self._bound:
+            return
+        self._bound = True
+        for engine in replica_router.candidates():
+            self._rebind(engine)
+            try:
+                await super().connection()
+                return
+            except _CONNECT_ERRORS as e:
+                logger.warning("No se pudo conectar a la replica: %s", e)
+                await self.close()
+                replica_router.eject(engine)
+        self._rebind(async_engine)
+
+    def _rebind(self, engine: AsyncEngine) -> None:
+        self.bind = engine
+        self.sync_session.bind = engine.sync_engine
+
+    async def connection(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().connection(*args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args, **kwargs):
+        await self._bind_replica()
+        return await super().stream_scalars(*args, **kwargs)
+
+
+ReadSessionLocal: async_sessionmaker = async_sessionmaker(
+    class_=ReplicaSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def _recent_write_key(user_id: int) -> str:
+    return f"db:recent_write:{user_id}"
+
+
+async def mark_recent_write(*user_ids: int) -> None:
+    """Enviar al primario las lecturas de los usuarios por DB_REPLICA_STICKY_SECONDS (despues del commit)"""
+    if not replica_router.engines:
+        return
+    for user_id in user_ids:
+        await cache.set(_recent_write_key(user_id), b"1", ttl=settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def _eject_if_connection_lost(db: AsyncSession, exc: DBAPIError) -> None:
+    # Conexion perdida a mitad de la peticion: sacar la replica de rotacion
+    if exc.connection_invalidated and db.bind in replica_router.engines:
+        replica_router.eject(db.bind)
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Sesion de solo lectura sobre una replica (o el primario si no hay replicas sanas)"""
+    db = ReadSessionLocal() if replica_router.engines else AsyncSessionLocal()
+    async with db:
+        try:
+            yield db
+        except DBAPIError as e:
+            _eject_if_connection_lost(db, e)
+            raise
+
+
+async def get_user_read_db(user_id: int = Depends(get_current_user_id)) -> AsyncIterator[AsyncSession]:
+    """Como get_read_db, pero usa el primario si el usuario escribio hace poco"""
+    use_replica = replica_router.engines and await cache.get(_recent_write_key(user_id)) is None
+    db = ReadSessionLocal() if use_replica else AsyncSessionLocal()
+    async with db:
+        try:
+            yield db
+        except DBAPIError as e:
+            _eject_if_connection_lost(db, e)
+            raise
@@ -1,10 +1,13 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 from app.core.config import settings
+from app.core.metrics import record_query
+from app.db.pool import InstrumentedAsyncQueuePool
 
-# Crear engine de SQLAlchemy
+# Engine sincrono (psycopg2): usado por Alembic y scripts fuera de la API
 engine: create_engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -14,17 +17,51 @@ engine: create_engine = create_engine(
 # Crear SessionLocal
 SessionLocal: sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Cantidad y duracion de las sentencias SQL (por peticion, ver app/core/middleware.py)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+def create_api_engine(url: str, **engine_options) -> AsyncEngine:
+    """Engine asincrono con la configuracion de pool y la instrumentacion de la API"""
+    api_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+        echo=False,
+        **engine_options
+    )
+    event.listen(api_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(api_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return api_engine
+
+
+# Engine asincrono (asyncpg) del primario: usado por todos los endpoints
+async_engine = create_api_engine(settings.ASYNC_DATABASE_URL)
+
+# expire_on_commit=False: los objetos siguen siendo legibles despues del commit
+# sin disparar un lazy load (no permitido en el contexto asincrono)
+AsyncSessionLocal: async_sessionmaker = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base para los modelos
 Base: declarative_base = declarative_base()
 
 
 # Dependency para obtener la sesión de DB
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
-
-
@@ -0,0 +1,37 @@
+"""
+Esperar a que PostgreSQL acepte conexiones: python -m app.db.wait_for_db
+
+Reintenta un SELECT 1 hasta DB_WAIT_TIMEOUT segundos; sale con codigo 1 si
+la base de datos no responde a tiempo.
+"""
+import logging
+import sys
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+def wait_for_db(timeout: float, interval: float = 1.0) -> bool:
+    """Devolver True cuando la base de datos responde, False si se agota el tiempo"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return True
+        except OperationalError as e:
+            if time.monotonic() >= deadline:
+                logger.error("PostgreSQL no respondio en %ss: %s", timeout, e)
+                return False
+            time.sleep(interval)
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(0 if wait_for_db(settings.DB_WAIT_TIMEOUT) else 1)
@@ -1,13 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
 from app.api import auth_api, task_api
 from app.core.handlers import validation_exception_handler, http_exception_handler, general_exception_handler
+from app.core.auth import token_cache
+from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, REQUEST_QUERIES, DB_QUERY_DURATION, RATE_LIMITED, format_histogram, format_metric
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.middleware import CompressionMiddleware, MetricsMiddleware, RequestIdMiddleware
+from app.core.security import shutdown_password_pool, password_pool_stats
+from app.db.pool import pool_stats
+from app.db.session import async_engine
+from app.db.replicas import replica_router
+from app.services.overdue_sweeper import start_overdue_sweeper, stop_overdue_sweeper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    start_overdue_sweeper()
+    yield
+    await stop_overdue_sweeper()
+    shutdown_password_pool()
+    await async_engine.dispose()
+    await replica_router.dispose()
+    shutdown_logging()
+
 
 app = FastAPI(
     title="Prueba Técnica Logika API",
     description="API desarrollada con FastAPI",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configuración de CORS
@@ -18,6 +44,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compresion gzip / br / zstd segun Accept-Encoding
+app.add_middleware(CompressionMiddleware)
+# Métricas por ruta y header Server-Timing (ver /metrics)
+app.add_middleware(MetricsMiddleware)
+# Id de peticion en los logs y en el header X-Request-ID
+app.add_middleware(RequestIdMiddleware)
 
 # Registrar manejadores de excepciones globales
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -38,6 +70,51 @@ async def health_check():
     """Endpoint para verificar el estado de la API"""
     return {"status": "healthy"}
 
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Estado del pool de conexiones del proceso actual"""
+    stats = pool_stats(async_engine)
+    if replica_router.engines:
+        stats["replicas"] = replica_router.stats()
+    return stats
+
+
+@app.get("/health/token-cache")
+async def token_cache_health():
+    """Aciertos y fallos de la cache de tokens JWT del proceso actual"""
+    return token_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métricas del proceso actual en formato de texto de Prometheus"""
+    pool = pool_stats(async_engine)
+    tokens = token_cache.stats()
+    bcrypt_pool = password_pool_stats()
+
+    lines = REQUEST_LATENCY.render() + REQUEST_COUNT.render() + REQUEST_QUERIES.render() + RATE_LIMITED.render()
+    lines += ["# HELP db_query_duration_seconds Duracion de las sentencias SQL", "# TYPE db_query_duration_seconds histogram"]
+    lines += format_histogram("db_query_duration_seconds", DB_QUERY_DURATION.snapshot())
+    lines += format_metric("db_pool_connections", "gauge", "Conexiones del pool por estado", [
+        ({"state": "checked_in"}, pool["checked_in"]),
+        ({"state": "checked_out"}, pool["checked_out"]),
+        ({"state": "overflow"}, pool["overflow"]),
+    ])
+    lines += format_metric("db_pool_size", "gauge", "Conexiones persistentes configuradas", [({}, pool["size"])])
+    if "wait_time_seconds" in pool:
+        lines += ["# HELP db_pool_wait_seconds Espera para obtener una conexion del pool", "# TYPE db_pool_wait_seconds histogram"]
+        lines += format_histogram("db_pool_wait_seconds", pool["wait_time_seconds"])
+    lines += format_metric("token_cache_requests_total", "counter", "Consultas a la cache de tokens JWT", [
+        ({"result": "hit"}, tokens["hits"]),
+        ({"result": "miss"}, tokens["misses"]),
+    ])
+    lines += format_metric("token_cache_entries", "gauge", "Tokens en la cache", [({}, tokens["size"])])
+    lines += format_metric("password_hash_in_flight", "gauge", "Operaciones de bcrypt en curso o en cola", [({}, bcrypt_pool["in_flight"])])
+    lines += format_metric("password_hash_capacity", "gauge", "Operaciones de bcrypt admitidas antes de responder 503", [({}, bcrypt_pool["capacity"])])
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
 # Registrar routers
 app.include_router(auth_api.router, prefix="/api/v1/auth", tags=["users"])
 app.include_router(task_api.router, prefix="/api/v1/tasks", tags=["tasks"])
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, BigInteger, String, Text, Enum as SQLEnum, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, BigInteger, String, Text, Enum as SQLEnum, DateTime, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 
@@ -13,17 +14,57 @@ class TaskStatus(str, enum.Enum):
     overdue = "overdue"
     
 
+# Tareas que todavia pueden vencerse. Se usa como SQL literal (no con parametros)
+# para que el planner pueda usar el indice parcial ix_tasks_due_date_open
+OPEN_TASKS_PREDICATE = "status IN ('pending', 'in_progress')"
+
+# Configuracion de text search de la busqueda y expresion de la columna generada
+SEARCH_CONFIG = "spanish"
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
 
 class Task(Base):
+    # Particionada por HASH (user_id) con PRIMARY KEY (id, user_id) en la base
+    # (ver migración 007). id sigue siendo unico (tasks_id_seq) y es la
+    # identidad del ORM; las consultas filtran por user_id para podar particiones
     __tablename__ = "tasks"
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False, index=True)
     status = Column(SQLEnum(TaskStatus), default=TaskStatus.pending, nullable=False)
     due_date = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Generada por Postgres (ver migración 006); diferida para no viajar en cada lectura
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
 
     # Relación con user
     user = relationship("User", back_populates="tasks")
+
+    # Índices de los listados paginados (ver migración 003)
+    __table_args__ = (
+        Index("ix_tasks_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        Index("ix_tasks_user_id_status_created_at", user_id, status, created_at.desc(), id.desc()),
+        Index("ix_tasks_status_created_at", status, created_at.desc(), id.desc()),
+        Index("ix_tasks_created_at_id", created_at.desc(), id.desc()),
+        # Barrido de tareas vencidas (ver migración 005)
+        Index("ix_tasks_due_date_open", due_date,
+              postgresql_where=text(f"{OPEN_TASKS_PREDICATE} AND due_date IS NOT NULL")),
+        # Busqueda por texto dentro de las tareas de un usuario (ver migración 006)
+        Index("ix_tasks_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_user_id_title_trgm", "user_id", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"}),
+    )
+
+
+class TaskCounter(Base):
+    """Cantidad de tareas por (usuario, status), mantenida por task_service"""
+    __tablename__ = "task_counters"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(SQLEnum(TaskStatus), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
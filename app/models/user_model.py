@@ -7,7 +7,7 @@ from app.db.session import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(BigInteger, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     name = Column(String(255), nullable=False)
     lastname = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime
 
 from app.models.task_model import TaskStatus
@@ -45,7 +45,53 @@ class TaskResponse(BaseModel):
 # Schema para lista de tareas
 class TaskListResponse(BaseModel):
     tasks: list[TaskResponse]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+# Schema para estadisticas de tareas
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: dict[TaskStatus, int]
+    overdue: int
+    due_this_week: int
+
+
+# Schema para un item de actualizacion masiva
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+# Schemas de las solicitudes masivas (cada item se valida por separado)
+class TaskBulkCreateRequest(BaseModel):
+    tasks: list[dict[str, Any]] = Field(..., min_length=1)
+
+
+class TaskBulkUpdateRequest(BaseModel):
+    tasks: list[dict[str, Any]] = Field(..., min_length=1)
+
+
+class TaskBulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+
+
+# Error de un item dentro de una operacion masiva
+class TaskBulkItemError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    detail: str
+
+
+# Schema para respuesta de creacion/actualizacion masiva
+class TaskBulkResponse(BaseModel):
+    tasks: list[TaskResponse]
+    errors: list[TaskBulkItemError]
+
+
+# Schema para respuesta de eliminacion masiva
+class TaskBulkDeleteResponse(BaseModel):
+    deleted_ids: list[int]
+    errors: list[TaskBulkItemError]
@@ -0,0 +1,81 @@
+"""
+Punto de entrada del servidor: python -m app.server
+
+- development: un proceso con --reload (vigila cambios en app/).
+- production: SERVER_WORKERS procesos con uvloop y httptools. Al recibir
+  SIGTERM cada worker deja de aceptar conexiones, espera hasta
+  SERVER_GRACEFUL_TIMEOUT a las peticiones en curso y ejecuta el lifespan de
+  apagado (cierra el pool de conexiones del worker).
+
+Con SERVER_WORKERS=0 (default) se usa un worker por CPU si el estado que
+deben compartir los procesos esta en Redis, y uno solo si no. Con varios
+workers y estado por proceso el servidor arranca igual, pero lo advierte.
+"""
+import logging
+import os
+import uvicorn
+from app.core.config import settings
+from app.core.logging_config import setup_logging, shutdown_logging
+
+logger = logging.getLogger(__name__)
+
+
+def per_process_state() -> list[str]:
+    """Funciones habilitadas que guardan en memoria del proceso estado que deberian compartir los workers"""
+    issues = []
+    if settings.REPLICA_URLS and settings.CACHE_BACKEND != "redis":
+        issues.append("DATABASE_REPLICA_URLS sin CACHE_BACKEND=redis: tras una escritura solo el mismo worker lee del primario")
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND != "redis":
+        issues.append("RATE_LIMIT_BACKEND=memory: cada worker tiene sus propios buckets (el limite efectivo se multiplica)")
+    if settings.TASK_CACHE_ENABLED and settings.CACHE_BACKEND != "redis":
+        issues.append("TASK_CACHE_ENABLED sin CACHE_BACKEND=redis: la invalidacion solo llega al worker que escribio")
+    return issues
+
+
+def resolve_workers() -> int:
+    """SERVER_WORKERS, o con 0 un worker por CPU si no hay estado por proceso (si no, 1)"""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    return 1 if per_process_state() else os.cpu_count() or 1
+
+
+def check_workers(workers: int) -> None:
+    """Advertir si varios workers no comparten el estado que deberian compartir"""
+    if workers <= 1:
+        return
+    for issue in per_process_state():
+        logger.warning("SERVER_WORKERS=%s con estado por proceso: %s", workers, issue)
+
+
+def main() -> None:
+    # Antes del primer log: sin el QueueHandler los mensajes del arranque se pierden
+    setup_logging()
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+    }
+
+    if settings.SERVER_MODE == "production":
+        options.update(
+            workers=resolve_workers(),
+            loop="uvloop",
+            http="httptools",
+            proxy_headers=True,
+            access_log=False,
+        )
+    else:
+        options.update(reload=True, reload_dirs=["app"])
+
+    check_workers(options.get("workers", 1))
+
+    logger.info("Iniciando servidor en modo %s (%s workers)", settings.SERVER_MODE, options.get('workers', 1))
+    try:
+        uvicorn.run("app.main:app", **options)
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,42 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import logging
 from app.models.user_model import User
-from app.schemas.user_schema import UserRegister
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user_schema import UserRegister, UserResponse
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async, needs_rehash
+from app.core.exceptions import ServiceUnavailableError
+from app.db.replicas import mark_recent_write
 from fastapi import HTTPException, status
 
 logger = logging.getLogger(__name__)
 
 
-def create_user(db: Session, user_data: UserRegister) -> User:
-    logger.info(f"Creando usuario con email: {user_data.email}")
+def _user_id_key(user_id: int) -> str:
+    return f"user:id:{user_id}"
+
+
+async def _cache_user(user: UserResponse) -> None:
+    # Solo datos publicos: el hash de la contraseña nunca sale de la base
+    await cache.set(_user_id_key(user.id), user.model_dump_json().encode("utf-8"), settings.USER_CACHE_TTL_SECONDS)
+
+
+async def create_user(db: AsyncSession, user_data: UserRegister) -> User:
+    logger.info("Creando usuario con email: %s", user_data.email)
     
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalar_one_or_none()
 
     if existing_user:
-        logger.warning(f"Intento de registro con email duplicado: {user_data.email}")
+        logger.warning("Intento de registro con email duplicado: %s", user_data.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El email ya esta registrado"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     new_user = User(
         name=user_data.name,
@@ -30,45 +46,75 @@ def create_user(db: Session, user_data: UserRegister) -> User:
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+
+    # Descartar cualquier entrada previa asociada a este ID
+    await cache.delete(_user_id_key(new_user.id))
+    # El usuario recien creado todavia puede no existir en las replicas
+    await mark_recent_write(new_user.id)
     
-    logger.info(f"Usuario creado exitosamente: {new_user.email} (ID: {new_user.id})")
+    logger.info("Usuario creado exitosamente: %s (ID: %s)", new_user.email, new_user.id)
     return new_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
-    logger.info(f"Autenticando usuario: {email}")
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> UserResponse:
+    logger.info("Autenticando usuario: %s", email)
     
-    user = db.query(User).filter(User.email == email).first()
+    # El hash se lee siempre de la base (no se cachea)
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
 
     if not user:
-        logger.warning(f"Intento de login fallido: usuario no existe ({email})")
+        logger.warning("Intento de login fallido: usuario no existe (%s)", email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas"
         )
     
-    if not verify_password(password, user.password):
-        logger.warning(f"Intento de login fallido: contrasena incorrecta ({email})")
+    if not await verify_password_async(password, user.password):
+        logger.warning("Intento de login fallido: contrasena incorrecta (%s)", email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas"
         )
     
-    logger.info(f"Usuario autenticado exitosamente: {user.email} (ID: {user.id})")
-    return user
+    # Actualizar el hash si fue generado con un costo distinto al configurado
+    if needs_rehash(user.password):
+        try:
+            new_hash = await get_password_hash_async(password)
+            await db.execute(update(User).where(User.id == user.id).values(password=new_hash))
+            await db.commit()
+            logger.info("Hash de contrasena actualizado para el usuario ID: %s", user.id)
+        except ServiceUnavailableError:
+            # El login ya es valido; se reintentara en el proximo inicio de sesion
+            logger.warning("Rehash omitido por saturacion del pool (ID: %s)", user.id)
+
+    logger.info("Usuario autenticado exitosamente: %s (ID: %s)", user.email, user.id)
+    user_response = UserResponse.model_validate(user)
+    # /auth/refresh lee el usuario por ID justo despues del login
+    await _cache_user(user_response)
+    return user_response
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[UserResponse]:
+    """Obtener un usuario por su ID (read-through sobre la cache)"""
+    logger.debug("Buscando usuario por ID: %s", user_id)
 
+    cached = await cache.get(_user_id_key(user_id))
+    if cached is not None:
+        logger.debug("Usuario encontrado en cache (ID: %s)", user_id)
+        return UserResponse.model_validate_json(cached)
 
-def get_user_by_id(db: Session, user_id: int) -> User:
-    """Obtener un usuario por su ID"""
-    logger.debug(f"Buscando usuario por ID: {user_id}")
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     
     if user:
-        logger.debug(f"Usuario encontrado: {user.email} (ID: {user.id})")
+        logger.debug("Usuario encontrado: %s (ID: %s)", user.email, user.id)
+        user = UserResponse.model_validate(user)
+        await _cache_user(user)
     else:
-        logger.warning(f"Usuario no encontrado (ID: {user_id})")
+        logger.warning("Usuario no encontrado (ID: %s)", user_id)
     
     return user
 
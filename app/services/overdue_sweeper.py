@@ -0,0 +1,75 @@
+"""
+Barrido periodico de tareas vencidas.
+
+Marca como overdue las tareas pending/in_progress cuya due_date ya paso, en
+lotes de OVERDUE_SWEEP_BATCH_SIZE. Corre como tarea de fondo en cada worker,
+pero cada lote lo procesa un solo worker: el que toma el advisory lock de
+transaccion de PostgreSQL; los demas saltean la pasada. El lock se libera con
+el commit o el rollback del lote, asi que un error no lo deja tomado en una
+conexion del pool. FOR UPDATE SKIP LOCKED cubre ademas a otras instancias del
+barrido que procesen lotes a la vez.
+"""
+from typing import Optional
+import asyncio
+import logging
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.task_service import mark_overdue_tasks
+
+logger = logging.getLogger(__name__)
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+# Clave del advisory lock de PostgreSQL que elige al worker que barre
+SWEEP_LOCK_ID = 0x6F766572647565
+
+
+async def sweep_overdue_tasks(batch_size: int) -> int:
+    """Procesar lotes hasta que no queden tareas vencidas por marcar (o otro worker este barriendo)"""
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Lock de la transaccion del lote: mark_overdue_tasks lo libera al terminar
+            acquired = (await db.execute(select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_ID)))).scalar_one()
+            if not acquired:
+                return total
+            updated = await mark_overdue_tasks(db, batch_size)
+        total += updated
+        if updated < batch_size:
+            return total
+
+
+async def _run_sweeper(interval: int, batch_size: int) -> None:
+    while True:
+        try:
+            await sweep_overdue_tasks(batch_size)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Error en el barrido de tareas vencidas: %s", e)
+        await asyncio.sleep(interval)
+
+
+def start_overdue_sweeper() -> None:
+    """Lanzar el barrido en segundo plano (si esta habilitado)"""
+    global _sweeper_task
+    if not settings.OVERDUE_SWEEP_ENABLED or _sweeper_task is not None:
+        return
+    logger.info("Iniciando barrido de tareas vencidas cada %ss", settings.OVERDUE_SWEEP_INTERVAL_SECONDS)
+    _sweeper_task = asyncio.create_task(
+        _run_sweeper(settings.OVERDUE_SWEEP_INTERVAL_SECONDS, settings.OVERDUE_SWEEP_BATCH_SIZE)
+    )
+
+
+async def stop_overdue_sweeper() -> None:
+    """Cancelar el barrido y esperar a que termine el lote en curso"""
+    global _sweeper_task
+    if _sweeper_task is None:
+        return
+    _sweeper_task.cancel()
+    try:
+        await _sweeper_task
+    except asyncio.CancelledError:
+        pass
+    _sweeper_task = None
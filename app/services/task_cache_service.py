@@ -0,0 +1,66 @@
+"""
+Cache versionada de respuestas de tareas por usuario.
+
+Cada usuario tiene una version; las respuestas se guardan bajo claves que la
+incluyen, y cualquier escritura sobre sus tareas la reemplaza (despues del
+commit), dejando inalcanzables todas las entradas anteriores sin borrarlas.
+"""
+from typing import Optional
+import hashlib
+import json
+import logging
+import time
+from app.core.cache import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(user_id: int) -> str:
+    return f"tasks:version:{user_id}"
+
+
+def _fingerprint(user_id: int, version: str, params: tuple) -> str:
+    # JSON y no un join: None y "None", o un ':' dentro de q, no deben colisionar
+    raw = json.dumps([user_id, version, *params], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+async def get_task_cache_version(user_id: int) -> Optional[str]:
+    """Version vigente de la cache del usuario (None si la cache esta deshabilitada)"""
+    if not settings.TASK_CACHE_ENABLED:
+        return None
+
+    version = await cache.get(_version_key(user_id))
+    if version is None:
+        # Una version nueva y unica: si la clave fue desalojada, nunca se
+        # reutiliza una version con respuestas viejas todavia en cache
+        version = str(time.time_ns()).encode("ascii")
+        await cache.set(_version_key(user_id), version)
+    return version.decode("ascii")
+
+
+async def bump_task_cache_version(*user_ids: int) -> None:
+    """Invalidar las respuestas cacheadas de los usuarios (llamar despues del commit)"""
+    if not settings.TASK_CACHE_ENABLED:
+        return
+
+    for user_id in user_ids:
+        await cache.set(_version_key(user_id), str(time.time_ns()).encode("ascii"))
+    logger.debug("Cache de tareas invalidada para usuarios: %s", user_ids)
+
+
+def build_etag(user_id: int, version: str, params: tuple) -> str:
+    return f'"{_fingerprint(user_id, version, params)}"'
+
+
+async def get_cached_response(user_id: int, version: str, params: tuple) -> Optional[bytes]:
+    return await cache.get(f"tasks:response:{_fingerprint(user_id, version, params)}")
+
+
+async def set_cached_response(user_id: int, version: str, params: tuple, body: bytes) -> None:
+    await cache.set(
+        f"tasks:response:{_fingerprint(user_id, version, params)}",
+        body,
+        settings.TASK_CACHE_TTL_SECONDS
+    )
@@ -1,16 +1,94 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Row, Select, BigInteger, DateTime, Text, and_, any_, bindparam, cast, delete, insert, or_, tuple_, func, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from collections import Counter
 from fastapi import HTTPException, status
 import logging
-from app.models.task_model import Task, TaskStatus
-from app.schemas.task_schema import TaskCreate, TaskUpdate
-from typing import List, Optional
+from app.models.task_model import Task, TaskStatus, TaskCounter, OPEN_TASKS_PREDICATE, SEARCH_CONFIG
+from app.schemas.task_schema import TaskCreate, TaskUpdate, TaskBulkUpdateItem
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.db.replicas import mark_recent_write
+from app.services.task_cache_service import bump_task_cache_version
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
+# Columnas que devuelven las lecturas y RETURNING (search_vector solo se usa para buscar)
+TASK_COLUMNS = [column for column in Task.__table__.c if column.key != "search_vector"]
 
-def create_task(db: Session, task_data: TaskCreate, user_id: int) -> Task:
 
-    logger.info(f"Creando tarea '{task_data.title}' para usuario {user_id}")
+def _task_columns(fields: Optional[Sequence[str]]) -> list:
+    """Columnas a leer: todas, o las pedidas mas las claves de orden y cursor (created_at, id)"""
+    if fields is None:
+        return TASK_COLUMNS
+    keys = set(fields) | {"id", "created_at"}
+    return [column for column in TASK_COLUMNS if column.key in keys]
+
+
+async def _apply_counter_deltas(db: AsyncSession, deltas: Counter) -> None:
+    """Sumar los cambios netos {(user_id, status): delta} a task_counters en un unico upsert
+
+    Las filas van ordenadas por (user_id, status): dos transacciones que tocan
+    los mismos contadores los bloquean en el mismo orden y no hay deadlock.
+    """
+    rows = [
+        {"user_id": user_id, "status": task_status, "count": delta}
+        for (user_id, task_status), delta in sorted(deltas.items(), key=lambda item: (item[0][0], item[0][1].value))
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(TaskCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskCounter.user_id, TaskCounter.status],
+        set_={"count": TaskCounter.count + stmt.excluded.count}
+    )
+    await db.execute(stmt)
+
+
+async def _after_write(*user_ids: int) -> None:
+    """Enviar las lecturas de los usuarios al primario por un momento e invalidar su cache (despues del commit)
+
+    La marca va primero: una lectura concurrente que ya vea la version nueva
+    tambien lee del primario y no guarda datos viejos de una replica.
+    """
+    await mark_recent_write(*user_ids)
+    await bump_task_cache_version(*user_ids)
+
+
+async def _count_tasks(db: AsyncSession, query: Select, user_id: Optional[int], status_filter: Optional[TaskStatus], exact: bool = False) -> int:
+    """Calcular el total de un listado segun TASK_COUNT_STRATEGY (exact=True fuerza COUNT)"""
+    strategy = "exact" if exact else settings.TASK_COUNT_STRATEGY
+
+    if strategy == "counter":
+        counter_query = select(func.coalesce(func.sum(TaskCounter.count), 0))
+        if user_id is not None:
+            counter_query = counter_query.where(TaskCounter.user_id == user_id)
+        if status_filter is not None:
+            counter_query = counter_query.where(TaskCounter.status == status_filter)
+        return int((await db.execute(counter_query)).scalar_one())
+
+    if strategy == "estimate" and user_id is None and status_filter is None:
+        # Estimacion del planner: la tabla padre particionada no tiene reltuples
+        # propio, se suman sus particiones (-1 si una particion nunca fue analizada)
+        estimate = (await db.execute(text("""
+            SELECT SUM(GREATEST(reltuples, 0))::bigint FROM pg_class
+            WHERE (oid = 'tasks'::regclass AND relkind = 'r')
+               OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = 'tasks'::regclass)
+        """))).scalar()
+        if estimate is not None and estimate > 0:
+            return int(estimate)
+
+    return (await db.execute(query.with_only_columns(func.count(Task.id)).order_by(None))).scalar_one()
+
+
+async def create_task(db: AsyncSession, task_data: TaskCreate, user_id: int) -> Task:
+
+    logger.info("Creando tarea '%s' para usuario %s", task_data.title, user_id)
     
     new_task = Task(
         title=task_data.title,
@@ -21,100 +99,445 @@ def create_task(db: Session, task_data: TaskCreate, user_id: int) -> Task:
     )
     
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await _apply_counter_deltas(db, Counter({(user_id, task_data.status): 1}))
+    await db.commit()
+    await _after_write(user_id)
+    await db.refresh(new_task)
     
-    logger.info(f"Tarea creada exitosamente (ID: {new_task.id}) para usuario {user_id}")
+    logger.info("Tarea creada exitosamente (ID: %s) para usuario %s", new_task.id, user_id)
     return new_task
 
 
-def get_task_by_id(db: Session, task_id: int, user_id: int) -> Task:
-    logger.debug(f"Buscando tarea ID {task_id} para usuario {user_id}")
+def _raise_task_not_found(task_id: int, user_id: int) -> None:
+    logger.warning("Tarea no encontrada o no pertenece al usuario (ID: %s, Usuario: %s)", task_id, user_id)
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Tarea no encontrada"
+    )
+
+
+async def get_task_by_id(db: AsyncSession, task_id: int, user_id: int, fields: Optional[Sequence[str]] = None) -> Task:
+    """Tarea del usuario; con fields solo se cargan esas columnas (el resto no debe accederse)"""
+    logger.debug("Buscando tarea ID %s para usuario %s", task_id, user_id)
     
-    task = db.query(Task).filter(
+    query = select(Task).where(
         Task.id == task_id,
         Task.user_id == user_id
-    ).first()
+    )
+    if fields is not None:
+        query = query.options(load_only(*(getattr(Task, field) for field in fields)))
+
+    result = await db.execute(query)
+    task = result.scalar_one_or_none()
     
     if not task:
-        logger.warning(f"Tarea no encontrada o no pertenece al usuario (ID: {task_id}, Usuario: {user_id})")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada"
-        )
+        _raise_task_not_found(task_id, user_id)
     
-    logger.debug(f"Tarea encontrada: ID {task_id}")
+    logger.debug("Tarea encontrada: ID %s", task_id)
     return task
 
 
-def get_user_tasks(db: Session, user_id: int, skip: int = 0, limit: int = 100, status_filter: Optional[TaskStatus] = None) -> tuple[List[Task], int]:
-    logger.debug(f"Consultando tareas para usuario {user_id} (skip: {skip}, limit: {limit}, filtro: {status_filter})")
+async def _paginate(db: AsyncSession, query: Select, skip: int, limit: int, cursor: Optional[str], rank: Optional[ColumnElement] = None) -> tuple[List[Row], Optional[str]]:
+    """Aplicar orden estable (created_at, id) y paginar por offset o por cursor
+
+    Con rank (busqueda por texto) el orden es (rank, created_at, id) y el rank
+    de la ultima fila viaja en el cursor.
+    """
+    keys = [Task.created_at, Task.id]
+    if rank is not None:
+        rank = rank.label("search_rank")
+        query = query.add_columns(rank)
+        keys.insert(0, rank)
+
+    if cursor is not None:
+        # Keyset: continuar justo despues de la ultima fila entregada, sin OFFSET
+        created_at, task_id, last_rank = decode_cursor(cursor)
+        if (last_rank is None) != (rank is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginacion invalido"
+            )
+        last_values = [created_at, task_id] if rank is None else [last_rank, created_at, task_id]
+        query = query.where(tuple_(*keys) < tuple_(*last_values))
+    else:
+        query = query.offset(skip)
+
+    # Se pide una fila extra para saber si existe una pagina siguiente
+    result = await db.execute(query.order_by(*(key.desc() for key in keys)).limit(limit + 1))
+    tasks = result.all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor(last.created_at, last.id, last.search_rank if rank is not None else None)
+
+    return tasks, next_cursor
+
+
+def _search_filter(q: str) -> tuple[ColumnElement, ColumnElement]:
+    """Condicion y rank de una busqueda por texto sobre titulo y descripcion
+
+    Combina text search (search_vector, con stemming en espanol) con trigramas
+    sobre el titulo para coincidencias parciales o por prefijo.
+    """
+    ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), q)
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    condition = or_(Task.search_vector.op("@@")(ts_query), Task.title.ilike(f"%{escaped}%", escape="\\"))
+    rank = func.ts_rank_cd(Task.search_vector, ts_query) + func.similarity(Task.title, q)
+    return condition, rank
+
+
+async def get_user_tasks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, status_filter: Optional[TaskStatus] = None, cursor: Optional[str] = None, include_total: bool = True, q: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> tuple[List[Row], Optional[int], Optional[str]]:
+    logger.debug("Consultando tareas para usuario %s (skip: %s, limit: %s, filtro: %s, cursor: %s, busqueda: %s)", user_id, skip, limit, status_filter, cursor, q)
     
-    query = db.query(Task).filter(Task.user_id == user_id)
+    # Filas planas (sin entidades ORM ni identity map): solo se serializan.
+    # Con fields no se leen las columnas no pedidas (por ejemplo description)
+    query = select(*_task_columns(fields)).where(Task.user_id == user_id)
     
     # Filtrar por status si se proporciona
     if status_filter is not None:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
+
+    # Busqueda por texto: resultados ordenados por relevancia
+    rank = None
+    if q is not None:
+        condition, rank = _search_filter(q)
+        query = query.where(condition)
     
-    total = query.count()
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    total = await _count_tasks(db, query, user_id, status_filter, exact=q is not None) if include_total else None
+    tasks, next_cursor = await _paginate(db, query, skip, limit, cursor, rank)
     
-    logger.debug(f"Retornando {len(tasks)} tareas de {total} totales para usuario {user_id}")
-    return tasks, total
+    logger.debug("Retornando %s tareas de %s totales para usuario %s", len(tasks), total, user_id)
+    return tasks, total, next_cursor
 
 
-def update_task(db: Session, task_id: int, task_data: TaskUpdate, user_id: int) -> Task:
-    """Actualizar una tarea"""
-    logger.info(f"Actualizando tarea ID {task_id} para usuario {user_id}")
-    
-    task = get_task_by_id(db, task_id, user_id)
+async def update_task(db: AsyncSession, task_id: int, task_data: TaskUpdate, user_id: int) -> Row:
+    """Actualizar una tarea con un unico UPDATE ... RETURNING"""
+    logger.info("Actualizando tarea ID %s para usuario %s", task_id, user_id)
     
     # Actualizar solo los campos proporcionados
-    updated_fields = []
-    if task_data.title is not None:
-        task.title = task_data.title
-        updated_fields.append("title")
-    if task_data.description is not None:
-        task.description = task_data.description
-        updated_fields.append("description")
-    if task_data.status is not None:
-        task.status = task_data.status
-        updated_fields.append("status")
-    if task_data.due_date is not None:
-        task.due_date = task_data.due_date
-        updated_fields.append("due_date")
-    
-    db.commit()
-    db.refresh(task)
-    
-    logger.info(f"Tarea {task_id} actualizada exitosamente. Campos modificados: {', '.join(updated_fields) if updated_fields else 'ninguno'}")
-    return task
+    changes = task_data.model_dump(exclude_none=True)
+    if not changes:
+        task = await get_task_by_id(db, task_id, user_id)
+        logger.info("Tarea %s sin cambios: no se enviaron campos", task_id)
+        return task
+
+    tasks_table = Task.__table__
+    stmt = (
+        update(tasks_table)
+        .where(tasks_table.c.id == task_id, tasks_table.c.user_id == user_id)
+        .values(**changes)
+        .returning(*TASK_COLUMNS)
+    )
+
+    if "status" in changes:
+        # La fila bloqueada aporta el status previo para task_counters
+        previous = (
+            select(tasks_table.c.id, tasks_table.c.status)
+            .where(tasks_table.c.id == task_id, tasks_table.c.user_id == user_id)
+            .with_for_update()
+            .subquery("previous")
+        )
+        stmt = (
+            stmt.where(previous.c.id == tasks_table.c.id)
+            .returning(previous.c.status.label("previous_status"))
+        )
 
+    task = (await db.execute(stmt)).first()
+    if task is None:
+        await db.rollback()
+        _raise_task_not_found(task_id, user_id)
 
-def delete_task(db: Session, task_id: int, user_id: int) -> None:
+    if "status" in changes and task.status != task.previous_status:
+        await _apply_counter_deltas(db, Counter({(user_id, task.previous_status): -1, (user_id, task.status): 1}))
 
-    logger.info(f"Eliminando tarea ID {task_id} para usuario {user_id}")
+    await db.commit()
+    await _after_write(user_id)
     
-    task = get_task_by_id(db, task_id, user_id)
+    logger.info("Tarea %s actualizada exitosamente. Campos modificados: %s", task_id, ', '.join(changes))
+    return task
+
+
+async def delete_task(db: AsyncSession, task_id: int, user_id: int) -> None:
+
+    logger.info("Eliminando tarea ID %s para usuario %s", task_id, user_id)
     
-    db.delete(task)
-    db.commit()
+    tasks_table = Task.__table__
+    result = await db.execute(
+        delete(tasks_table)
+        .where(tasks_table.c.id == task_id, tasks_table.c.user_id == user_id)
+        .returning(tasks_table.c.id, tasks_table.c.status)
+    )
+    deleted = result.first()
+
+    if deleted is None:
+        await db.rollback()
+        _raise_task_not_found(task_id, user_id)
+
+    await _apply_counter_deltas(db, Counter({(user_id, deleted.status): -1}))
+    await db.commit()
+    await _after_write(user_id)
     
-    logger.info(f"Tarea {task_id} eliminada exitosamente")
+    logger.info("Tarea %s eliminada exitosamente", task_id)
 
 
-def get_all_tasks(db: Session, skip: int = 0, limit: int = 100, status_filter: Optional[TaskStatus] = None) -> tuple[List[Task], int]:
+async def get_all_tasks(db: AsyncSession, skip: int = 0, limit: int = 100, status_filter: Optional[TaskStatus] = None, cursor: Optional[str] = None, include_total: bool = True, fields: Optional[Sequence[str]] = None) -> tuple[List[Row], Optional[int], Optional[str]]:
 
-    logger.debug(f"Consultando todas las tareas (skip: {skip}, limit: {limit}, filtro: {status_filter})")
+    logger.debug("Consultando todas las tareas (skip: %s, limit: %s, filtro: %s, cursor: %s)", skip, limit, status_filter, cursor)
     
-    query = db.query(Task)
+    query = select(*_task_columns(fields))
     
     # Filtrar por status si se proporciona
     if status_filter is not None:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
     
-    total = query.count()
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    total = await _count_tasks(db, query, None, status_filter) if include_total else None
+    tasks, next_cursor = await _paginate(db, query, skip, limit, cursor)
     
-    logger.debug(f"Retornando {len(tasks)} tareas de {total} totales (todas las tareas)")
-    return tasks, total
+    logger.debug("Retornando %s tareas de %s totales (todas las tareas)", len(tasks), total)
+    return tasks, total, next_cursor
+
+
+
+async def get_task_stats(db: AsyncSession, user_id: Optional[int] = None) -> dict:
+    """Conteos por status, vencidas y que vencen en los proximos 7 dias (user_id=None para todas)
+
+    Una tarea abierta con due_date pasada cuenta como vencida aunque el barrido
+    todavia no la haya marcado como overdue.
+    """
+    logger.debug("Calculando estadisticas de tareas (usuario: %s)", user_id)
+
+    tasks_table = Task.__table__
+    now = func.now()
+    is_open = text(OPEN_TASKS_PREDICATE)
+    past_due = and_(is_open, tasks_table.c.due_date < now)
+    due_soon = and_(is_open, tasks_table.c.due_date >= now, tasks_table.c.due_date < now + timedelta(days=7))
+
+    if settings.TASK_COUNT_STRATEGY == "counter":
+        # Conteos por status desde task_counters; las fechas solo se evaluan sobre
+        # tareas abiertas con due_date (indice parcial ix_tasks_due_date_open)
+        counter_query = select(TaskCounter.status, func.sum(TaskCounter.count)).group_by(TaskCounter.status)
+        if user_id is not None:
+            counter_query = counter_query.where(TaskCounter.user_id == user_id)
+        by_status = {task_status: int(count) for task_status, count in await db.execute(counter_query)}
+
+        due_query = (
+            select(
+                func.count().filter(tasks_table.c.due_date < now).label("past_due"),
+                func.count().filter(tasks_table.c.due_date >= now).label("due_this_week"),
+            )
+            .where(is_open, tasks_table.c.due_date < now + timedelta(days=7))
+        )
+        if user_id is not None:
+            due_query = due_query.where(tasks_table.c.user_id == user_id)
+        dates = (await db.execute(due_query)).one()
+        overdue = by_status.get(TaskStatus.overdue, 0) + dates.past_due
+        due_this_week = dates.due_this_week
+    else:
+        columns = [func.count().filter(tasks_table.c.status == task_status).label(task_status.value) for task_status in TaskStatus]
+        query = select(
+            *columns,
+            func.count().filter(or_(tasks_table.c.status == TaskStatus.overdue, past_due)).label("overdue_total"),
+            func.count().filter(due_soon).label("due_this_week"),
+        )
+        if user_id is not None:
+            query = query.where(tasks_table.c.user_id == user_id)
+        row = (await db.execute(query)).one()
+        by_status = {task_status: getattr(row, task_status.value) for task_status in TaskStatus}
+        overdue = row.overdue_total
+        due_this_week = row.due_this_week
+
+    by_status = {task_status.value: by_status.get(task_status, 0) for task_status in TaskStatus}
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "overdue": overdue,
+        "due_this_week": due_this_week,
+    }
+
+
+async def bulk_create_tasks(db: AsyncSession, tasks_data: List[TaskCreate], user_id: int) -> List[Task]:
+    """Crear varias tareas con un unico INSERT ... RETURNING"""
+    logger.info("Creando %s tareas en bloque para usuario %s", len(tasks_data), user_id)
+
+    rows = [
+        {
+            "title": task_data.title,
+            "description": task_data.description,
+            "status": task_data.status,
+            "due_date": task_data.due_date,
+            "user_id": user_id,
+        }
+        for task_data in tasks_data
+    ]
+
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True),
+        rows
+    )
+    tasks = result.all()
+
+    await _apply_counter_deltas(db, Counter((user_id, task_data.status) for task_data in tasks_data))
+    await db.commit()
+    await _after_write(user_id)
+
+    logger.info("%s tareas creadas en bloque para usuario %s", len(tasks), user_id)
+    return tasks
+
+
+async def bulk_update_tasks(db: AsyncSession, items: List[TaskBulkUpdateItem], user_id: int) -> List[Row]:
+    """Actualizar varias tareas del usuario con un unico UPDATE ... FROM unnest(...)
+
+    Los campos en None conservan su valor actual. Las tareas inexistentes o de
+    otro usuario simplemente no aparecen en el resultado.
+    """
+    logger.info("Actualizando %s tareas en bloque para usuario %s", len(items), user_id)
+
+    # Un arreglo tipado por columna: la cantidad de parametros no depende del
+    # numero de items y Postgres conoce el tipo de cada columna
+    values = func.unnest(
+        cast(bindparam("ids", [item.id for item in items]), ARRAY(BigInteger)),
+        cast(bindparam("titles", [item.title for item in items]), ARRAY(Text)),
+        cast(bindparam("descriptions", [item.description for item in items]), ARRAY(Text)),
+        cast(bindparam("statuses", [item.status.value if item.status else None for item in items]), ARRAY(Text)),
+        cast(bindparam("due_dates", [item.due_date for item in items]), ARRAY(DateTime(timezone=True))),
+    ).table_valued("id", "title", "description", "status", "due_date").render_derived(name="v")
+
+    # Filas afectadas bloqueadas con FOR UPDATE: aportan el status previo al
+    # UPDATE (RETURNING solo expone los valores nuevos) sin carreras con otras
+    # escrituras concurrentes sobre las mismas tareas
+    tasks_table = Task.__table__
+    previous = (
+        select(tasks_table.c.id, tasks_table.c.status)
+        .where(
+            tasks_table.c.id == any_(cast(bindparam("locked_ids", [item.id for item in items]), ARRAY(BigInteger))),
+            tasks_table.c.user_id == user_id
+        )
+        .with_for_update()
+        .subquery("previous")
+    )
+
+    stmt = (
+        update(tasks_table)
+        .where(
+            tasks_table.c.id == values.c.id,
+            tasks_table.c.user_id == user_id,
+            previous.c.id == tasks_table.c.id
+        )
+        .values(
+            title=func.coalesce(values.c.title, tasks_table.c.title),
+            description=func.coalesce(values.c.description, tasks_table.c.description),
+            status=func.coalesce(cast(values.c.status, tasks_table.c.status.type), tasks_table.c.status),
+            due_date=func.coalesce(values.c.due_date, tasks_table.c.due_date),
+        )
+        .returning(*TASK_COLUMNS, previous.c.status.label("previous_status"))
+    )
+    result = await db.execute(stmt)
+
+    tasks = result.all()
+    deltas = Counter()
+    for task in tasks:
+        if task.status != task.previous_status:
+            deltas[(user_id, task.previous_status)] -= 1
+            deltas[(user_id, task.status)] += 1
+
+    await _apply_counter_deltas(db, deltas)
+    await db.commit()
+    await _after_write(user_id)
+
+    logger.info("%s tareas actualizadas en bloque para usuario %s", len(tasks), user_id)
+    return tasks
+
+
+async def bulk_delete_tasks(db: AsyncSession, task_ids: List[int], user_id: int) -> List[int]:
+    """Eliminar varias tareas del usuario con un unico DELETE ... WHERE id = ANY(...)"""
+    logger.info("Eliminando %s tareas en bloque para usuario %s", len(task_ids), user_id)
+
+    stmt = (
+        delete(Task)
+        .where(
+            Task.user_id == user_id,
+            Task.id == any_(cast(bindparam("ids", task_ids), ARRAY(BigInteger)))
+        )
+        .returning(Task.id, Task.status)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    deltas = Counter()
+    for _, task_status in rows:
+        deltas[(user_id, task_status)] -= 1
+
+    await _apply_counter_deltas(db, deltas)
+    await db.commit()
+    await _after_write(user_id)
+
+    logger.info("%s tareas eliminadas en bloque para usuario %s", len(rows), user_id)
+    return [task_id for task_id, _ in rows]
+
+
+async def mark_overdue_tasks(db: AsyncSession, batch_size: int = 500) -> int:
+    """Marcar como overdue un lote de tareas abiertas con due_date vencida.
+
+    Las filas se bloquean con FOR UPDATE SKIP LOCKED para que varios workers
+    puedan barrer en paralelo sin esperar entre ellos. Devuelve las tareas
+    actualizadas; si es igual a batch_size puede quedar trabajo pendiente.
+    """
+    tasks_table = Task.__table__
+    due = (
+        select(tasks_table.c.id, tasks_table.c.user_id, tasks_table.c.status)
+        .where(text(OPEN_TASKS_PREDICATE), tasks_table.c.due_date < func.now())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    stmt = (
+        update(tasks_table)
+        # (id, user_id) es la PRIMARY KEY de la tabla particionada (migración 007)
+        .where(tasks_table.c.id == due.c.id, tasks_table.c.user_id == due.c.user_id)
+        .values(status=TaskStatus.overdue)
+        .returning(tasks_table.c.user_id, due.c.status.label("previous_status"))
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    if not rows:
+        await db.rollback()
+        return 0
+
+    deltas = Counter()
+    for user_id, previous_status in rows:
+        deltas[(user_id, previous_status)] -= 1
+        deltas[(user_id, TaskStatus.overdue)] += 1
+
+    await _apply_counter_deltas(db, deltas)
+    await db.commit()
+    users = {user_id for user_id, _ in rows}
+    await _after_write(*users)
+
+    logger.info("%s tareas marcadas como overdue (%s usuarios)", len(rows), len(users))
+    return len(rows)
+
+
+
+async def stream_user_tasks(db: AsyncSession, user_id: int, status_filter: Optional[TaskStatus] = None, since: Optional[datetime] = None, batch_size: int = 1000) -> AsyncIterator[List[Row]]:
+    """Recorrer todas las tareas del usuario con un cursor del servidor, en lotes de batch_size"""
+    logger.debug("Exportando tareas para usuario %s (filtro: %s, desde: %s)", user_id, status_filter, since)
+
+    tasks_table = Task.__table__
+    query = select(*TASK_COLUMNS).where(tasks_table.c.user_id == user_id)
+
+    if status_filter is not None:
+        query = query.where(tasks_table.c.status == status_filter)
+
+    # Exportacion incremental: solo tareas creadas despues de `since`
+    if since is not None:
+        query = query.where(tasks_table.c.created_at > since)
+
+    query = query.order_by(tasks_table.c.created_at, tasks_table.c.id)
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
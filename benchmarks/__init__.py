@@ -0,0 +1,8 @@
+"""
+Benchmarks de la API (ver docs/BENCHMARKS.md).
+
+- seed: carga usuarios y tareas de prueba en la base de datos configurada.
+- load: generador de carga HTTP asincrono; escribe p50/p95/p99 y RPS por endpoint en JSON.
+- compare: compara dos resultados de load (por ejemplo, entre commits).
+- micro: microbenchmarks de serializacion y de round-trips por escritura.
+"""
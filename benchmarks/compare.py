@@ -0,0 +1,48 @@
+"""
+Comparar dos resultados de benchmarks.load: python -m benchmarks.compare base.json nuevo.json
+
+Muestra, por concurrencia y endpoint, las metricas de ambos archivos y la
+variacion porcentual (negativa = mas rapido en latencias, peor en RPS).
+"""
+import argparse
+import json
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def compare(base: dict, current: dict) -> list[str]:
+    lines = [f"base: {base['meta'].get('commit')}  nuevo: {current['meta'].get('commit')}"]
+    for concurrency, endpoints in current["results"].items():
+        base_endpoints = base["results"].get(concurrency, {})
+        lines.append(f"\nconcurrencia {concurrency}")
+        lines.append(f"{'endpoint':<14}" + "".join(f"{metric:>28}" for metric in METRICS))
+        for name, summary in endpoints.items():
+            previous = base_endpoints.get(name)
+            cells = []
+            for metric in METRICS:
+                if previous is None:
+                    cells.append(f"{summary[metric]:>28}")
+                else:
+                    cells.append(f"{previous[metric]:>10} -> {summary[metric]:<8} {_change(previous[metric], summary[metric])}")
+            lines.append(f"{name:<14}" + "".join(f"{cell:>28}" for cell in cells))
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Comparar dos resultados de benchmarks.load")
+    parser.add_argument("base")
+    parser.add_argument("current")
+    args = parser.parse_args()
+
+    with open(args.base) as base_file, open(args.current) as current_file:
+        print("\n".join(compare(json.load(base_file), json.load(current_file))))
+
+
+if __name__ == "__main__":
+    main()
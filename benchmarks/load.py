@@ -0,0 +1,223 @@
+"""
+Generador de carga HTTP: python -m benchmarks.load --concurrency 50 200 1000 --output results.json
+
+Requiere la API corriendo y los datos de benchmarks.seed. Para cada nivel de
+concurrencia ejecuta los escenarios en orden (login, create, listados, update,
+delete) y registra latencia y RPS por endpoint. Las tareas creadas en
+"create" son las que luego se actualizan y eliminan.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+import httpx
+from benchmarks.seed import DEFAULT_PASSWORD, bench_email
+
+SCENARIOS = ("login", "create", "list_shallow", "list_deep", "list_cursor", "list_all", "update", "delete")
+
+
+class BenchUser:
+    """Usuario de benchmark con su token y las tareas que creo"""
+
+    def __init__(self, email: str, token: str):
+        self.email = email
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.created_ids: list[int] = []
+        self.next_cursor: Optional[str] = None
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Percentil por rango mas cercano sobre una lista ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, rate_limited: int = 0) -> dict:
+    ordered = sorted(latencies)
+    completed = len(ordered)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        # Respuestas 429 (incluidas en errors): la API tiene el rate limiting activo
+        "rate_limited": rate_limited,
+        "rps": round(completed / elapsed, 1) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / completed * 1000, 2) if completed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if completed else 0.0,
+    }
+
+
+async def run_scenario(concurrency: int, total_requests: int, request: Callable[[int], Awaitable[Optional[httpx.Response]]]) -> dict:
+    """Ejecutar total_requests llamadas con `concurrency` workers en paralelo
+
+    request(worker) devuelve la respuesta, o None si el worker no tiene mas
+    trabajo (por ejemplo, no quedan tareas para eliminar).
+    """
+    latencies: list[float] = []
+    errors = rate_limited = 0
+    remaining = total_requests
+
+    async def worker(number: int) -> None:
+        nonlocal remaining, errors, rate_limited
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await request(number)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response is None:
+                return
+            if response.is_success:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+                rate_limited += response.status_code == 429
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start, rate_limited)
+
+
+async def login_users(client: httpx.AsyncClient, count: int, password: str) -> list[BenchUser]:
+    users = []
+    for number in range(1, count + 1):
+        response = await client.post("/api/v1/auth/login", json={"email": bench_email(number), "password": password})
+        response.raise_for_status()
+        users.append(BenchUser(bench_email(number), response.json()["access_token"]))
+    return users
+
+
+def build_scenarios(client: httpx.AsyncClient, users: list[BenchUser], password: str, deep_page: int) -> dict[str, Callable]:
+    def user_for(worker: int) -> BenchUser:
+        return users[worker % len(users)]
+
+    async def login(worker):
+        return await client.post("/api/v1/auth/login", json={"email": user_for(worker).email, "password": password})
+
+    async def create(worker):
+        user = user_for(worker)
+        response = await client.post("/api/v1/tasks/", headers=user.headers, json={
+            "title": f"Tarea de benchmark {worker}",
+            "description": "Creada por benchmarks.load",
+            "status": "pending",
+        })
+        if response.is_success:
+            user.created_ids.append(response.json()["id"])
+        return response
+
+    async def list_shallow(worker):
+        return await client.get("/api/v1/tasks/", headers=user_for(worker).headers, params={"page": 1, "page_size": 10})
+
+    async def list_deep(worker):
+        return await client.get("/api/v1/tasks/", headers=user_for(worker).headers, params={"page": deep_page, "page_size": 10})
+
+    async def list_cursor(worker):
+        # Recorre las paginas siguiendo next_cursor y vuelve a empezar al llegar al final
+        user = user_for(worker)
+        params = {"page_size": 10, "include_total": "false"}
+        if user.next_cursor:
+            params["cursor"] = user.next_cursor
+        response = await client.get("/api/v1/tasks/", headers=user.headers, params=params)
+        if response.is_success:
+            user.next_cursor = response.json()["next_cursor"]
+        return response
+
+    async def list_all(worker):
+        return await client.get("/api/v1/tasks/all", params={"page": 1, "page_size": 10})
+
+    async def update(worker):
+        user = user_for(worker)
+        if not user.created_ids:
+            return None
+        task_id = user.created_ids[worker % len(user.created_ids)]
+        return await client.put(f"/api/v1/tasks/{task_id}", headers=user.headers, json={"status": "in_progress"})
+
+    async def delete(worker):
+        user = user_for(worker)
+        if not user.created_ids:
+            return None
+        return await client.delete(f"/api/v1/tasks/{user.created_ids.pop()}", headers=user.headers)
+
+    return {
+        "login": login,
+        "create": create,
+        "list_shallow": list_shallow,
+        "list_deep": list_deep,
+        "list_cursor": list_cursor,
+        "list_all": list_all,
+        "update": update,
+        "delete": delete,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {}
+    for concurrency in args.concurrency:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+            users = await login_users(client, min(args.users, concurrency), args.password)
+            scenarios = build_scenarios(client, users, args.password, args.deep_page)
+
+            results[str(concurrency)] = {}
+            for name in args.scenarios:
+                # Login es limitado por bcrypt: se mide con menos peticiones
+                total = args.login_requests if name == "login" else args.requests
+                summary = await run_scenario(concurrency, total, scenarios[name])
+                results[str(concurrency)][name] = summary
+                print(f"c={concurrency:<5} {name:<13} rps={summary['rps']:<9} p50={summary['p50_ms']}ms "
+                      f"p95={summary['p95_ms']}ms p99={summary['p99_ms']}ms errores={summary['errors']} 429={summary['rate_limited']}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=5000, help="Peticiones por escenario y nivel de concurrencia")
+    parser.add_argument("--login-requests", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100, help="Usuarios de benchmarks.seed a utilizar")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--deep-page", type=int, default=200, help="Pagina usada en list_deep (paginacion por offset)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "users": args.users,
+            "deep_page": args.deep_page,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Microbenchmarks: python -m benchmarks.micro [--db]
+
+- serialization: CPU por respuesta de un listado de 100 tareas, comparando
+  entidades ORM + jsonable_encoder + json.dumps (camino previo) con filas
+  planas + model_dump_json (PydanticJSONResponse).
+- compression: CPU por respuesta y bytes ahorrados al comprimir un listado
+  de 100 tareas con descripciones largas, por codificacion y nivel (br y
+  zstd solo si brotli / zstandard estan instalados).
+- update (--db): round-trips y latencia de actualizar una tarea con
+  SELECT + ORM + commit + refresh (camino previo) frente a update_task
+  (un UPDATE ... RETURNING). Requiere los datos de benchmarks.seed.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from app.core.compression import brotli, zstandard
+from app.core.metrics import track_queries, stop_tracking_queries
+from app.core.responses import PydanticJSONResponse
+from app.models.task_model import Task, TaskStatus
+from app.models.user_model import User
+from app.schemas.task_schema import TaskListResponse, TaskUpdate
+from app.services.task_service import TASK_COLUMNS, update_task
+from benchmarks.seed import BENCH_EMAIL_PATTERN
+
+TaskRow = namedtuple("TaskRow", [column.key for column in TASK_COLUMNS])
+
+
+def _sample_tasks(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": number,
+            "title": f"Tarea {number}",
+            "description": "Descripcion de prueba para el benchmark de serializacion",
+            "user_id": 1,
+            "status": TaskStatus.pending,
+            "due_date": now + timedelta(days=number % 30),
+            "created_at": now - timedelta(minutes=number),
+        }
+        for number in range(count)
+    ]
+
+
+def _cpu_per_call(func, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations
+
+
+def bench_serialization(page_size: int = 100, iterations: int = 500) -> dict:
+    data = _sample_tasks(page_size)
+    entities = [Task(**task) for task in data]
+    rows = [TaskRow(**task) for task in data]
+    page = {"total": 1000, "page": 1, "page_size": page_size, "total_pages": 10}
+
+    def orm_jsonable_encoder():
+        response = TaskListResponse.model_validate({"tasks": entities, **page})
+        return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+    def rows_model_dump_json():
+        return PydanticJSONResponse(TaskListResponse(tasks=rows, **page)).body
+
+    before = _cpu_per_call(orm_jsonable_encoder, iterations)
+    after = _cpu_per_call(rows_model_dump_json, iterations)
+    return {
+        "page_size": page_size,
+        "orm_jsonable_encoder_ms": round(before * 1000, 3),
+        "rows_model_dump_json_ms": round(after * 1000, 3),
+        "speedup": round(before / after, 2) if after else None,
+    }
+
+
+DESCRIPTION_WORDS = (
+    "revisar", "informe", "cliente", "entrega", "reunion", "presupuesto", "equipo", "proveedor",
+    "factura", "pendiente", "urgente", "documentacion", "servidor", "despliegue", "pruebas", "contrato",
+    "semana", "objetivo", "analisis", "propuesta", "del", "para", "con", "antes", "despues", "el", "la",
+)
+
+
+def _listing_payload(page_size: int = 100) -> bytes:
+    """Pagina de listado con descripciones de 200 a 2000 caracteres"""
+    generator = random.Random(42)
+    tasks = _sample_tasks(page_size)
+    for task in tasks:
+        words = []
+        length = generator.randint(200, 2000)
+        while sum(len(word) + 1 for word in words) < length:
+            words.append(generator.choice(DESCRIPTION_WORDS))
+        task["description"] = " ".join(words).capitalize() + "."
+    rows = [TaskRow(**task) for task in tasks]
+    return TaskListResponse(tasks=rows, total=1000, page=1, page_size=page_size, total_pages=10).model_dump_json().encode("utf-8")
+
+
+def bench_compression(iterations: int = 200) -> dict:
+    body = _listing_payload()
+    codecs = {f"gzip-{level}": (lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0)) for level in (1, 5, 6, 9)}
+    if brotli is not None:
+        codecs.update({f"br-{quality}": (lambda data, quality=quality: brotli.compress(data, quality=quality)) for quality in (1, 4, 11)})
+    if zstandard is not None:
+        codecs.update({f"zstd-{level}": (lambda data, level=level: zstandard.ZstdCompressor(level=level).compress(data)) for level in (1, 3, 10)})
+
+    results = {"body_bytes": len(body)}
+    for name, compress in codecs.items():
+        size = len(compress(body))
+        # br-11 es mucho mas lento que el resto: menos iteraciones
+        runs = max(10, iterations // 10) if name == "br-11" else iterations
+        results[name] = {
+            "bytes": size,
+            "saved_pct": round((1 - size / len(body)) * 100, 1),
+            "cpu_ms": round(_cpu_per_call(lambda: compress(body), runs) * 1000, 3),
+        }
+    return results
+
+
+async def bench_update(iterations: int = 200) -> dict:
+    from app.db.session import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        user_id = (await db.execute(select(User.id).where(User.email.like(BENCH_EMAIL_PATTERN)).limit(1))).scalar_one()
+        task_id = (await db.execute(select(Task.id).where(Task.user_id == user_id).limit(1))).scalar_one()
+
+    async def orm_update(db, description):
+        # Camino previo: SELECT, mutacion por el ORM, commit y refresh
+        task = (await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))).scalar_one()
+        task.description = description
+        await db.commit()
+        await db.refresh(task)
+
+    async def returning_update(db, description):
+        await update_task(db, task_id, TaskUpdate(description=description), user_id)
+
+    results = {}
+    for name, operation in (("orm_select_commit_refresh", orm_update), ("update_returning", returning_update)):
+        latencies, queries = [], []
+        for number in range(iterations):
+            async with AsyncSessionLocal() as db:
+                stats, token = track_queries()
+                start = time.perf_counter()
+                await operation(db, f"{name} {number}")
+                latencies.append(time.perf_counter() - start)
+                stop_tracking_queries(token)
+                queries.append(stats.count)
+        results[name] = {
+            "statements_per_update": statistics.mean(queries),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+            "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000, 3),
+        }
+
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de la API")
+    parser.add_argument("--db", action="store_true", help="Incluir los benchmarks que usan la base de datos")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", help="Guardar los resultados en un archivo JSON")
+    args = parser.parse_args()
+
+    results = {
+        "serialization": bench_serialization(iterations=args.iterations),
+        "compression": bench_compression(min(args.iterations, 200)),
+    }
+    if args.db:
+        results["update"] = asyncio.run(bench_update(min(args.iterations, 200)))
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report)
+
+
+if __name__ == "__main__":
+    main()
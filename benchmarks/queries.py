@@ -0,0 +1,126 @@
+"""
+Latencia de las consultas por usuario: python -m benchmarks.queries --output antes.json
+
+Ejecuta directamente (sin HTTP ni cache) las consultas de task_service que
+filtran por user_id sobre usuarios de benchmarks.seed elegidos al azar, una a
+la vez. Sirve para medir el efecto de cambios de esquema (por ejemplo el
+particionado de la migración 007) con el mismo volumen de datos; el JSON tiene
+el formato de benchmarks.load y se compara con benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from sqlalchemy import select, text
+from app.models.task_model import Task, TaskStatus
+from app.models.user_model import User
+from app.services.task_service import get_task_by_id, get_task_stats, get_user_tasks
+from benchmarks.load import git_commit, summarize
+from benchmarks.seed import BENCH_EMAIL_PATTERN
+
+EXPLAIN_SQL = """
+    EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+    SELECT id, title, description, user_id, status, due_date, created_at FROM tasks
+    WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 10
+"""
+
+
+async def _list_first_page(db, user_id: int) -> None:
+    await get_user_tasks(db, user_id, limit=10)
+
+
+async def _list_cursor(db, user_id: int) -> None:
+    _, _, next_cursor = await get_user_tasks(db, user_id, limit=10, include_total=False)
+    await get_user_tasks(db, user_id, limit=10, cursor=next_cursor, include_total=False)
+
+
+async def _list_status(db, user_id: int) -> None:
+    await get_user_tasks(db, user_id, limit=10, status_filter=TaskStatus.pending)
+
+
+async def _search(db, user_id: int) -> None:
+    await get_user_tasks(db, user_id, limit=10, q="tarea")
+
+
+async def _stats(db, user_id: int) -> None:
+    await get_task_stats(db, user_id)
+
+
+async def _get_task(db, user_id: int) -> None:
+    task_id = (await db.execute(select(Task.id).where(Task.user_id == user_id).limit(1))).scalar_one()
+    await get_task_by_id(db, task_id, user_id)
+
+
+QUERIES = {
+    "list_first": _list_first_page,
+    "list_cursor": _list_cursor,
+    "list_status": _list_status,
+    "search": _search,
+    "stats": _stats,
+    "get_task": _get_task,
+}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.db.session import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        user_ids = (await db.execute(select(User.id).where(User.email.like(BENCH_EMAIL_PATTERN)))).scalars().all()
+        if not user_ids:
+            raise SystemExit("No hay usuarios de benchmark: ejecutar antes python -m benchmarks.seed")
+        if args.explain:
+            plan = (await db.execute(text(EXPLAIN_SQL), {"user_id": random.choice(user_ids)})).scalars().all()
+            print("\n".join(plan))
+
+    results = {}
+    for name in args.queries:
+        query = QUERIES[name]
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            user_id = random.choice(user_ids)
+            async with AsyncSessionLocal() as db:
+                query_start = time.perf_counter()
+                try:
+                    await query(db, user_id)
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - query_start)
+        results[name] = summarize(latencies, errors, time.perf_counter() - start)
+        print(f"{name:<12} p50={results[name]['p50_ms']}ms p95={results[name]['p95_ms']}ms "
+              f"p99={results[name]['p99_ms']}ms errores={errors}")
+
+    await async_engine.dispose()
+    return {"1": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latencia de las consultas por usuario")
+    parser.add_argument("--iterations", type=int, default=1000, help="Consultas por escenario")
+    parser.add_argument("--queries", nargs="+", choices=list(QUERIES), default=list(QUERIES))
+    parser.add_argument("--explain", action="store_true", help="Mostrar el plan del listado de un usuario")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla para elegir los usuarios")
+    parser.add_argument("--output", default="benchmarks/queries.json")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Cargar datos de prueba: python -m benchmarks.seed --users 100 --tasks-per-user 1000
+
+Los usuarios se crean como bench{n}@bench.example.com con la misma contrasena.
+Volver a ejecutar el seed reemplaza los usuarios y tareas de benchmark
+anteriores; el resto de los datos no se modifica.
+"""
+import argparse
+import time
+from sqlalchemy import text
+from app.core.security import get_password_hash
+from app.db.session import engine
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_EMAIL_PATTERN = f"bench%@{BENCH_EMAIL_DOMAIN}"
+DEFAULT_PASSWORD = "bench-password"
+
+
+def bench_email(number: int) -> str:
+    return f"bench{number}@{BENCH_EMAIL_DOMAIN}"
+
+
+def seed(users: int, tasks_per_user: int, password: str = DEFAULT_PASSWORD) -> None:
+    """Reemplazar los usuarios de benchmark y generar sus tareas con generate_series"""
+    hashed_password = get_password_hash(password)
+    params = {"pattern": BENCH_EMAIL_PATTERN}
+
+    with engine.begin() as connection:
+        start = time.perf_counter()
+        bench_users = "SELECT id FROM users WHERE email LIKE :pattern"
+        connection.execute(text(f"DELETE FROM tasks WHERE user_id IN ({bench_users})"), params)
+        connection.execute(text(f"DELETE FROM task_counters WHERE user_id IN ({bench_users})"), params)
+        connection.execute(text("DELETE FROM users WHERE email LIKE :pattern"), params)
+
+        connection.execute(text("""
+            INSERT INTO users (name, lastname, email, password)
+            SELECT 'Bench', 'User ' || n, 'bench' || n || '@' || :domain, :password
+            FROM generate_series(1, :users) AS n
+        """), {"domain": BENCH_EMAIL_DOMAIN, "password": hashed_password, "users": users})
+
+        # Estados repartidos, un tercio sin due_date y el resto entre -20 y +40 dias
+        connection.execute(text("""
+            INSERT INTO tasks (title, description, status, due_date, user_id, created_at)
+            SELECT 'Tarea ' || n || ' del usuario ' || u.id,
+                   'Descripcion de prueba ' || md5(n::text),
+                   (ARRAY['pending', 'in_progress', 'completed', 'overdue'])[1 + n % 4]::taskstatus,
+                   CASE WHEN n % 3 = 0 THEN NULL ELSE now() + ((n % 60) - 20) * interval '1 day' END,
+                   u.id,
+                   now() - n * interval '1 minute'
+            FROM users u CROSS JOIN generate_series(1, :tasks_per_user) AS n
+            WHERE u.email LIKE :pattern
+        """), {**params, "tasks_per_user": tasks_per_user})
+
+        connection.execute(text(f"""
+            INSERT INTO task_counters (user_id, status, count)
+            SELECT user_id, status, COUNT(*) FROM tasks
+            WHERE user_id IN ({bench_users})
+            GROUP BY user_id, status
+        """), params)
+        elapsed = time.perf_counter() - start
+
+    # ANALYZE fuera de la transaccion para que el planner vea los volumenes nuevos
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE users"))
+        connection.execute(text("ANALYZE tasks"))
+        connection.execute(text("ANALYZE task_counters"))
+
+    print(f"{users} usuarios y {users * tasks_per_user} tareas creados en {elapsed:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cargar usuarios y tareas de benchmark")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    args = parser.parse_args()
+    seed(args.users, args.tasks_per_user, args.password)
+
+
+if __name__ == "__main__":
+    main()
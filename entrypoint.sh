@@ -2,7 +2,7 @@
 # Script para ejecutar migraciones de Alembic en Docker
 
 echo "Esperando a que PostgreSQL esté listo..."
-sleep 5
+python -m app.db.wait_for_db || exit 1
 
 echo "Ejecutando migraciones de Alembic..."
 alembic upgrade head
@@ -14,5 +14,5 @@ else
     exit 1
 fi
 
-echo "Iniciando aplicación FastAPI..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+echo "Iniciando aplicación FastAPI (modo: ${SERVER_MODE:-development})..."
+exec python -m app.server
@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.fixture(scope="session")
+def db_connection():
+    """Conexion sincrona a la base de .env.local (ya migrada); sin base, el test se saltea"""
+    from app.db.session import engine
+
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL no disponible: {e.orig}")
+    yield connection
+    connection.close()
+    engine.dispose()
@@ -0,0 +1,67 @@
+from datetime import timedelta
+import time
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security.http import HTTPAuthorizationCredentials
+from app.core import auth
+from app.core.auth import TokenCache, create_access_token, decode_access_token, get_current_user_id
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_token_cache_hit_and_miss():
+    cache = TokenCache(10)
+    assert cache.get("token") is None
+    cache.set("token", 7, time.time() + 60)
+    assert cache.get("token") == 7
+    assert cache.stats() == {"size": 1, "max_size": 10, "hits": 1, "misses": 1}
+
+
+def test_token_cache_drops_expired_tokens():
+    cache = TokenCache(10)
+    cache.set("token", 7, time.time() - 1)
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at)
+    cache.set("b", 2, expires_at)
+    cache.get("a")
+    cache.set("c", 3, expires_at)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_token_cache_disabled():
+    cache = TokenCache(0)
+    cache.set("token", 7, time.time() + 60)
+    assert cache.get("token") is None
+
+
+def test_valid_token_is_cached(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", TokenCache(10))
+    token = create_access_token({"sub": "5"}, timedelta(minutes=5))
+    assert get_current_user_id(_credentials(token)) == 5
+    assert auth.token_cache.get(token) == 5
+
+
+def test_token_without_exp_is_rejected(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", TokenCache(10))
+    token = jwt.encode({"sub": "5"}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    assert decode_access_token(token) is None
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user_id(_credentials(token))
+    assert exc_info.value.status_code == 401
+
+
+def test_expired_token_is_rejected():
+    token = create_access_token({"sub": "5"}, timedelta(seconds=-1))
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user_id(_credentials(token))
+    assert exc_info.value.status_code == 401
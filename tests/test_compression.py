@@ -0,0 +1,91 @@
+import gzip
+import zlib
+import pytest
+from app.core import compression
+from app.core.compression import compress_body, is_compressible, negotiate_encoding
+
+
+@pytest.fixture(autouse=True)
+def all_encodings(monkeypatch):
+    # Independiente de que brotli / zstandard esten instalados
+    monkeypatch.setattr(compression, "ENCODINGS", ["zstd", "br", "gzip"])
+    monkeypatch.setattr(compression.settings, "COMPRESSION_ENABLED", True)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip, br, zstd", "zstd"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=invalido", None),
+    ("*", "zstd"),
+    ("*;q=0.5, gzip", "gzip"),
+    ("*, zstd;q=0", "br"),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_encoding_disabled(monkeypatch):
+    monkeypatch.setattr(compression.settings, "COMPRESSION_ENABLED", False)
+    assert negotiate_encoding("gzip") is None
+
+
+def test_gzip_is_deterministic_and_round_trips():
+    body = b'{"tasks": []}' * 200
+    compressed = compress_body(body, "gzip")
+    assert compressed == compress_body(body, "gzip")
+    assert gzip.decompress(compressed) == body
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/json", True),
+    ("text/csv; charset=utf-8", True),
+    ("application/x-ndjson", True),
+    ("image/png", False),
+    (None, False),
+])
+def test_is_compressible(content_type, expected):
+    assert is_compressible(content_type) is expected
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "br":
+        return compression.brotli.decompress(data)
+    return compression.zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_codecs_round_trip(encoding):
+    if encoding not in compression.CODECS:
+        pytest.skip(f"{encoding} no instalado")
+    body = b'{"tasks": []}' * 200
+    assert _decompress(compress_body(body, encoding), encoding) == body
+
+
+def _incremental_decompress(encoding: str):
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == "br":
+        return compression.brotli.Decompressor().process
+    return compression.zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_stream_compressor_emits_complete_chunks(encoding):
+    if encoding not in compression.CODECS:
+        pytest.skip(f"{encoding} no instalado")
+    compressor = compression.stream_compressor(encoding)
+    decompress = _incremental_decompress(encoding)
+    # Cada bloque se descomprime completo sin esperar al resto de la respuesta
+    for chunk in (b'{"id": 1}\n' * 50, b'{"id": 2}\n' * 50):
+        assert decompress(compressor.compress(chunk)) == chunk
+    assert decompress(compressor.finish()) == b""
@@ -0,0 +1,96 @@
+"""
+Los listados de tareas usan los indices de la migracion 003.
+
+Las sentencias son las que emite task_service (get_user_tasks / get_all_tasks
+y _paginate), compiladas con el dialecto de PostgreSQL y los valores en
+linea, tanto la primera pagina (OFFSET) como la de cursor (keyset
+(created_at, id) < (...)). Con enable_seqscan = off el plan no depende del
+volumen de datos: si el indice sirve para el filtro y el orden, Postgres lo
+usa y no agrega ningun Sort. Con la tabla particionada (007) el plan muestra
+los indices de cada particion (tasks_pN_<sufijo>).
+"""
+from datetime import datetime, timezone
+import asyncio
+import re
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.core.pagination import encode_cursor
+from app.models.task_model import TaskStatus
+from app.services.task_service import get_all_tasks, get_user_tasks
+
+CURSOR = encode_cursor(datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc), 1000)
+
+
+class _EmptyResult:
+    def all(self) -> list:
+        return []
+
+
+class CompilingSession:
+    """Sesion falsa que guarda el SQL de cada sentencia en vez de ejecutarla"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})))
+        return _EmptyResult()
+
+
+def _listing_sql(listing, **kwargs) -> str:
+    db = CompilingSession()
+    asyncio.run(listing(db, include_total=False, limit=10, **kwargs))
+    [sql] = db.statements
+    return sql
+
+
+# (llamada al servicio, sufijo del indice esperado)
+LISTINGS = {
+    "GET /tasks": (lambda: _listing_sql(get_user_tasks, user_id=1), "user_id_created_at_id"),
+    "GET /tasks (cursor)": (lambda: _listing_sql(get_user_tasks, user_id=1, cursor=CURSOR), "user_id_created_at_id"),
+    "GET /tasks?status_filter": (lambda: _listing_sql(get_user_tasks, user_id=1, status_filter=TaskStatus.pending), "user_id_status_created_at"),
+    "GET /tasks?status_filter (cursor)": (
+        lambda: _listing_sql(get_user_tasks, user_id=1, status_filter=TaskStatus.pending, cursor=CURSOR), "user_id_status_created_at"
+    ),
+    "GET /tasks/all": (lambda: _listing_sql(get_all_tasks), "created_at_id"),
+    "GET /tasks/all (cursor)": (lambda: _listing_sql(get_all_tasks, cursor=CURSOR), "created_at_id"),
+    "GET /tasks/all?status_filter": (lambda: _listing_sql(get_all_tasks, status_filter=TaskStatus.pending), "status_created_at"),
+    "GET /tasks/all?status_filter (cursor)": (
+        lambda: _listing_sql(get_all_tasks, status_filter=TaskStatus.pending, cursor=CURSOR), "status_created_at"
+    ),
+}
+
+
+def _plan(connection, sql: str) -> list[str]:
+    with connection.begin():
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        return list(connection.execute(text(f"EXPLAIN (COSTS OFF) {sql}")).scalars())
+
+
+def _sort_lines(plan: list[str]) -> list[str]:
+    # Merge Append (una rama por particion) informa su "Sort Key:" al combinar
+    # indices ya ordenados; cualquier otra linea con Sort (Sort, Incremental
+    # Sort) es un ordenamiento en memoria
+    merge_append = any("Merge Append" in line for line in plan)
+    return [
+        line for line in plan
+        if "Sort" in line and not (merge_append and line.strip().startswith("Sort Key:"))
+    ]
+
+
+def test_listings_compile_to_the_keyset_form():
+    sql, _ = LISTINGS["GET /tasks (cursor)"]
+    statement = sql()
+    assert "(tasks.created_at, tasks.id) < (" in statement
+    assert "ORDER BY tasks.created_at DESC, tasks.id DESC" in statement
+    assert "LIMIT 11" in statement and "SELECT tasks.id, tasks.title" in statement
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("endpoint", list(LISTINGS))
+def test_listing_uses_index_without_sort(db_connection, endpoint):
+    sql, index_suffix = LISTINGS[endpoint]
+    plan = _plan(db_connection, sql())
+    assert re.search(rf"\b(?:ix_tasks|tasks_p\d+)_{index_suffix}\b", "\n".join(plan)), plan
+    assert not _sort_lines(plan), plan
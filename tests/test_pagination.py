@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor
+
+CREATED_AT = datetime(2026, 10, 17, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(CREATED_AT, 42)) == (CREATED_AT, 42, None)
+
+
+def test_cursor_round_trip_with_rank():
+    assert decode_cursor(encode_cursor(CREATED_AT, 42, 0.25)) == (CREATED_AT, 42, 0.25)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(CREATED_AT, 42)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "no-es-un-cursor", "W10", "WyJ4IiwxXQ", "WyIyMDI2LTEwLTE3IiwxLDEsMV0"])
+def test_invalid_cursor_is_rejected(cursor):
+    # "", basura, [], ["x",1] y una lista con valores de mas
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import InMemoryRateLimiter, parse_rate
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_parse_rate():
+    assert parse_rate("10/60") == (10, 10 / 60)
+
+
+@pytest.mark.parametrize("spec", ["10", "10/0", "0/60", "-1/60", "a/60", "10/60/1"])
+def test_parse_rate_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_rate(spec)
+
+
+def test_bucket_admits_up_to_capacity_then_waits(clock):
+    limiter = InMemoryRateLimiter()
+    # 2 peticiones cada 10 segundos: un token cada 5s
+    waits = [asyncio.run(limiter.acquire("auth:ip:1", 2, 0.2)) for _ in range(3)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(5.0)
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = InMemoryRateLimiter()
+    for _ in range(2):
+        asyncio.run(limiter.acquire("auth:ip:1", 2, 0.2))
+
+    clock[0] += 2.5
+    assert asyncio.run(limiter.acquire("auth:ip:1", 2, 0.2)) == pytest.approx(2.5)
+    clock[0] += 5
+    assert asyncio.run(limiter.acquire("auth:ip:1", 2, 0.2)) == 0.0
+
+
+def test_buckets_are_independent_per_key(clock):
+    limiter = InMemoryRateLimiter()
+    asyncio.run(limiter.acquire("auth:ip:1", 1, 0.1))
+    assert asyncio.run(limiter.acquire("auth:ip:1", 1, 0.1)) > 0
+    assert asyncio.run(limiter.acquire("auth:ip:2", 1, 0.1)) == 0.0
+
+
+def test_evicted_bucket_starts_full(clock):
+    limiter = InMemoryRateLimiter(max_keys=1)
+    asyncio.run(limiter.acquire("auth:ip:1", 1, 0.1))
+    asyncio.run(limiter.acquire("auth:ip:2", 1, 0.1))
+    assert asyncio.run(limiter.acquire("auth:ip:1", 1, 0.1)) == 0.0
@@ -0,0 +1,41 @@
+import logging
+import pytest
+from app import server
+
+
+@pytest.fixture
+def shared_state(monkeypatch):
+    monkeypatch.setattr(server.settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(server.settings, "RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setattr(server.settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(server.settings, "TASK_CACHE_ENABLED", True)
+    monkeypatch.setattr(server.settings, "DATABASE_REPLICA_URLS", "postgresql://u:p@replica/db")
+    monkeypatch.setattr(server.settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 8)
+
+
+def test_auto_workers_use_every_cpu_with_shared_state(shared_state):
+    assert server.per_process_state() == []
+    assert server.resolve_workers() == 8
+
+
+def test_auto_workers_fall_back_to_one_with_per_process_state(shared_state, monkeypatch):
+    monkeypatch.setattr(server.settings, "RATE_LIMIT_BACKEND", "memory")
+    assert server.resolve_workers() == 1
+
+
+def test_explicit_workers_win(shared_state, monkeypatch):
+    monkeypatch.setattr(server.settings, "SERVER_WORKERS", 3)
+    monkeypatch.setattr(server.settings, "CACHE_BACKEND", "memory")
+    assert server.resolve_workers() == 3
+
+
+def test_per_process_state_only_warns(shared_state, monkeypatch, caplog):
+    monkeypatch.setattr(server.settings, "CACHE_BACKEND", "memory")
+    with caplog.at_level(logging.WARNING, logger=server.logger.name):
+        server.check_workers(4)
+    # Replicas y cache de tareas dependen de CACHE_BACKEND
+    assert len(caplog.records) == 2
+    caplog.clear()
+    server.check_workers(1)
+    assert not caplog.records
@@ -0,0 +1,47 @@
+import asyncio
+from collections import Counter
+from sqlalchemy.dialects import postgresql
+from app.models.task_model import TaskStatus
+from app.services.task_service import _apply_counter_deltas
+
+
+class RecordingSession:
+    """Sesion falsa que guarda las sentencias compiladas en vez de ejecutarlas"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})))
+
+
+def _apply(deltas: Counter) -> list[str]:
+    db = RecordingSession()
+    asyncio.run(_apply_counter_deltas(db, deltas))
+    return db.statements
+
+
+def test_deltas_are_one_upsert_sorted_by_user_and_status():
+    deltas = Counter()
+    # Orden de insercion opuesto al orden de bloqueo esperado
+    deltas[(2, TaskStatus.pending)] -= 1
+    deltas[(1, TaskStatus.pending)] -= 1
+    deltas[(1, TaskStatus.completed)] += 1
+    deltas[(2, TaskStatus.overdue)] += 1
+
+    [statement] = _apply(deltas)
+    assert "VALUES (1, 'completed', 1), (1, 'pending', -1), (2, 'overdue', 1), (2, 'pending', -1)" in statement
+    assert "ON CONFLICT (user_id, status) DO UPDATE SET count = (task_counters.count + excluded.count)" in statement
+
+
+def test_opposite_transitions_lock_in_the_same_order():
+    forward = _apply(Counter({(1, TaskStatus.pending): -1, (1, TaskStatus.completed): 1}))
+    backward = _apply(Counter({(1, TaskStatus.completed): -1, (1, TaskStatus.pending): 1}))
+    assert forward[0].index("'completed'") < forward[0].index("'pending'")
+    assert backward[0].index("'completed'") < backward[0].index("'pending'")
+
+
+def test_zero_deltas_are_dropped():
+    statements = _apply(Counter({(1, TaskStatus.pending): 0, (1, TaskStatus.completed): 1}))
+    assert "'pending'" not in statements[0]
+    assert _apply(Counter({(1, TaskStatus.pending): 0})) == []
@@ -0,0 +1,22 @@
+import pytest
+from app.api.task_api import TASK_FIELDS, _parse_fields
+from app.core.exceptions import ValidationError
+
+
+def test_no_fields_means_all():
+    assert _parse_fields(None) is None
+
+
+def test_fields_use_canonical_order():
+    assert _parse_fields("status, title,title") == ("title", "status")
+
+
+def test_all_fields_is_the_same_as_none():
+    assert _parse_fields(",".join(reversed(TASK_FIELDS))) is None
+
+
+@pytest.mark.parametrize("fields", ["", " , ", "title,password", "nope"])
+def test_invalid_fields_are_rejected(fields):
+    with pytest.raises(ValidationError) as exc_info:
+        _parse_fields(fields)
+    assert exc_info.value.status_code == 422